@@ -4,11 +4,15 @@ API v1 - All v1 endpoints
 from django.urls import path, include
 from users.views.auth_cookies import CookieLoginView, CookieRegisterView, CookieLogoutView, CookieTokenRefreshView
 from users.views.profile import user_profile
-from .views import GlobalVersionView
+from .views import GlobalVersionView, CatalogSnapshotView, CatalogChangesView
 
 urlpatterns = [
     # Version check
     path('version/', GlobalVersionView.as_view(), name='global_version'),
+    # Catálogo completo em um único documento (cacheado por versão)
+    path('catalog/snapshot/', CatalogSnapshotView.as_view(), name='catalog_snapshot'),
+    # Sincronização incremental: apenas o que mudou desde ?since=<versão>
+    path('catalog/changes/', CatalogChangesView.as_view(), name='catalog_changes'),
     # Authentication endpoints customizados com cookies HttpOnly
     path('auth/login/', CookieLoginView.as_view(), name='rest_login'),
     path('auth/logout/', CookieLogoutView.as_view(), name='rest_logout'),
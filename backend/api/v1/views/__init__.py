@@ -1 +1,2 @@
 from .version import GlobalVersionView
+from .catalog import CatalogSnapshotView, CatalogChangesView
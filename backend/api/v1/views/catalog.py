@@ -0,0 +1,54 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from common.catalog import get_catalog_snapshot, get_catalog_changes
+from common.models import CatalogTombstone
+
+class CatalogSnapshotView(APIView):
+    """
+    Retorna o catálogo completo (armaduras, armas, estratagemas, boosters,
+    warbonds...) em um único documento, versionado pela GlobalVersion.
+    """
+    permission_classes = []  # Público
+
+    def get(self, request):
+        return Response(get_catalog_snapshot(request))
+
+
+class CatalogChangesView(APIView):
+    """
+    Sincronização incremental do catálogo.
+    Query params: ?since=<versão ISO retornada por version/ ou snapshot/>
+    Retorna: { "version": ..., "changes": {seção: [...]}, "deleted": {seção: [ids]} }
+    Um `since` mais antigo que a retenção das exclusões responde 410 com
+    "full_resync": o cliente deve baixar o snapshot/ completo de novo.
+    """
+    permission_classes = []  # Público
+
+    def get(self, request):
+        raw_since = request.query_params.get('since')
+        if not raw_since:
+            return Response(
+                {"detail": "since é obrigatório"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # O '+' do fuso horário chega como espaço quando não é codificado na URL
+        try:
+            since = parse_datetime(raw_since.replace(' ', '+'))
+        except ValueError:
+            since = None
+        if since is None or since.tzinfo is None:
+            return Response(
+                {"detail": "since deve ser um timestamp ISO 8601 com fuso horário"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if since < CatalogTombstone.retention_cutoff():
+            return Response(
+                {"detail": "since anterior à retenção de exclusões; baixe o snapshot completo", "full_resync": True},
+                status=status.HTTP_410_GONE
+            )
+
+        return Response(get_catalog_changes(request, since))
@@ -1,15 +1,20 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from common.models import GlobalVersion
+from common.versioning import GLOBAL_RESOURCE, get_versions
 
 class GlobalVersionView(APIView):
     """
-    Retorna o timestamp da última atualização global.
+    Retorna o timestamp da última atualização global e o mapa de versões
+    por recurso ('armory', 'weaponry', 'stratagems', 'boosters', 'warbonds').
     """
     permission_classes = []  # Público
 
     def get(self, request):
-        version, _ = GlobalVersion.objects.get_or_create(resource='global')
+        versions = get_versions()
         return Response({
-            'updated_at': version.updated_at.isoformat()
+            'updated_at': versions.pop(GLOBAL_RESOURCE).isoformat(),
+            'resources': {
+                resource: updated_at.isoformat()
+                for resource, updated_at in versions.items()
+            }
         })
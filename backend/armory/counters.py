@@ -0,0 +1,199 @@
+"""
+Contadores desnormalizados de curtidas/favoritos dos UserSets
+
+likes_count, favorites_count e popularity (soma dos dois) são ajustados com
+UPDATE ... SET col = col + delta na mesma transação do add/remove do M2M (ver
+armory.signals). Caminhos que escrevem direto na tabela intermediária
+(bulk_create, DELETE direto, exclusão de usuários) não passam pelos sinais:
+reconcile_counters() recalcula a partir das tabelas de curtidas/favoritos.
+
+toggle_vote() é o caminho dos endpoints like/favorite: escreve direto na tabela
+intermediária (sem carregar os votos do set) e ajusta o contador ele mesmo.
+
+Com USERSET_COUNTERS_WRITE_BEHIND, toggle_vote() não toca a linha do UserSet
+(um set viral não vira fila de travas): cada voto grava um UserSetCounterDelta
+(só INSERT) e flush_pending_counters() os aplica em lote. As leituras somam o
+pendente (pending_deltas), então quem curtiu vê o contador já atualizado.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .models import UserSet, UserSetCounterDelta
+
+
+# relação M2M -> coluna do contador
+COUNTER_COLUMNS = {
+    'likes': 'likes_count',
+    'favorites': 'favorites_count',
+}
+
+
+def through_fields(relation):
+    """(tabela intermediária, campo do set, campo do usuário) da relação"""
+    field = UserSet._meta.get_field(relation)
+    return field.remote_field.through, field.m2m_field_name(), field.m2m_reverse_field_name()
+
+
+def adjust_counters(relation, deltas, using=None):
+    """Aplica {set_id: delta} ao contador da relação e à popularidade (uma query por delta distinto)"""
+    column = COUNTER_COLUMNS[relation]
+    by_delta = defaultdict(list)
+    for set_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(set_id)
+    manager = UserSet.objects.db_manager(using)
+    for delta, set_ids in by_delta.items():
+        manager.filter(pk__in=set_ids).update(**{
+            column: F(column) + delta,
+            'popularity': F('popularity') + delta,
+        })
+
+
+def _delete_rows(queryset):
+    """
+    DELETE único das linhas do queryset, sem SELECT nem sinais. Retorna quantas saíram.
+
+    Os receivers globais de post_delete (common.signals) impedem o fast delete,
+    e .delete() faria SELECT + DELETE + sinais por linha. Só é seguro para
+    modelos sem dependentes (cascata) e sem receivers que importem: a tabela
+    intermediária dos votos e UserSetCounterDelta, cujos efeitos nos
+    contadores são aplicados por quem chama.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def toggle_vote(relation, set_id, user_id):
+    """
+    Alterna o voto do usuário no set. Retorna (ativo, contador atualizado).
+
+    DELETE da linha; se nada saiu, INSERT (a unique de set+usuário resolve
+    cliques simultâneos: o perdedor vê o voto já ativo e não soma de novo).
+    """
+    through, set_field, user_field = through_fields(relation)
+    column = COUNTER_COLUMNS[relation]
+    lookup = {f'{set_field}_id': set_id, f'{user_field}_id': user_id}
+    with transaction.atomic():
+        if _delete_rows(through.objects.filter(**lookup)):
+            active, delta = False, -1
+        else:
+            try:
+                with transaction.atomic():
+                    through.objects.create(**lookup)
+                active, delta = True, 1
+            except IntegrityError:
+                active, delta = True, 0
+        if write_behind_enabled():
+            if delta:
+                UserSetCounterDelta.objects.create(user_set_id=set_id, **{relation: delta})
+            count = UserSet.objects.filter(pk=set_id).values_list(column, flat=True).first()
+            if count is not None:
+                count += pending_deltas([set_id]).get(set_id, {}).get(relation, 0)  # inclui este voto
+        else:
+            adjust_counters(relation, {set_id: delta})
+            count = UserSet.objects.filter(pk=set_id).values_list(column, flat=True).first()
+    return active, count
+
+
+def write_behind_enabled():
+    return getattr(settings, 'USERSET_COUNTERS_WRITE_BEHIND', False)
+
+
+def pending_deltas(set_ids):
+    """{set_id: {'likes': n, 'favorites': n}} ainda não aplicados (vazio sem write-behind)"""
+    if not write_behind_enabled() or not set_ids:
+        return {}
+    rows = (
+        UserSetCounterDelta.objects.filter(user_set_id__in=set_ids)
+        .values_list('user_set_id').annotate(likes=Sum('likes'), favorites=Sum('favorites')).order_by()
+    )
+    return {set_id: {'likes': likes, 'favorites': favorites} for set_id, likes, favorites in rows}
+
+
+def flush_pending_counters(batch_size=10_000):
+    """
+    Aplica os deltas pendentes aos UserSets, em lotes. Retorna quantos deltas
+    foram consumidos. Lotes travados por outro flush são pulados (skip_locked),
+    e cada delta é apagado na mesma transação em que é somado.
+    """
+    flushed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                UserSetCounterDelta.objects.select_for_update(skip_locked=True)
+                .order_by('pk').values_list('pk', 'user_set_id', 'likes', 'favorites')[:batch_size]
+            )
+            if not batch:
+                return flushed
+            totals = {relation: defaultdict(int) for relation in COUNTER_COLUMNS}
+            for _, set_id, likes, favorites in batch:
+                totals['likes'][set_id] += likes
+                totals['favorites'][set_id] += favorites
+            for relation, deltas in totals.items():
+                adjust_counters(relation, deltas)
+            _delete_rows(UserSetCounterDelta.objects.filter(pk__in=[row[0] for row in batch]))
+        flushed += len(batch)
+
+
+def actual_counts(relation, set_ids, using=None):
+    """Contagem real na tabela intermediária para os sets informados"""
+    through, set_field, _ = through_fields(relation)
+    return dict(
+        through.objects.using(using).filter(**{f'{set_field}_id__in': set_ids})
+        .values_list(f'{set_field}_id').annotate(total=Count('pk')).order_by()
+    )
+
+
+def reconcile_counters(queryset=None, batch_size=10_000, dry_run=False):
+    """
+    Corrige sets cujos contadores divergem das tabelas de curtidas/favoritos.
+    Retorna quantos sets estavam divergentes.
+
+    A detecção roda sem travas; os sets divergentes são recontados sob
+    select_for_update, então toggles concorrentes esperam e somam por cima.
+    """
+    queryset = (queryset if queryset is not None else UserSet.objects.all()).order_by('pk')
+    fixed = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).values_list(
+            'pk', 'likes_count', 'favorites_count', 'popularity',
+        )[:batch_size])
+        if not batch:
+            return fixed
+        last_pk = batch[-1][0]
+
+        set_ids = [row[0] for row in batch]
+        likes, favorites = _expected_counts(set_ids)
+        drifted = [
+            pk for pk, likes_count, favorites_count, popularity in batch
+            if (likes_count, favorites_count, popularity)
+            != (likes.get(pk, 0), favorites.get(pk, 0), likes.get(pk, 0) + favorites.get(pk, 0))
+        ]
+        fixed += len(drifted)
+        if drifted and not dry_run:
+            _repair(drifted)
+
+
+def _expected_counts(set_ids):
+    """Valores que as colunas devem ter: contagem real menos o que ainda está no buffer"""
+    likes = actual_counts('likes', set_ids)
+    favorites = actual_counts('favorites', set_ids)
+    for set_id, pending in pending_deltas(set_ids).items():
+        likes[set_id] = likes.get(set_id, 0) - pending['likes']
+        favorites[set_id] = favorites.get(set_id, 0) - pending['favorites']
+    return likes, favorites
+
+
+def _repair(set_ids):
+    with transaction.atomic():
+        user_sets = list(UserSet.objects.select_for_update().filter(pk__in=set_ids).only('pk'))
+        likes, favorites = _expected_counts(set_ids)
+        for user_set in user_sets:
+            user_set.likes_count = likes.get(user_set.pk, 0)
+            user_set.favorites_count = favorites.get(user_set.pk, 0)
+            user_set.popularity = user_set.likes_count + user_set.favorites_count
+        UserSet.objects.bulk_update(user_sets, ['likes_count', 'favorites_count', 'popularity'])
@@ -0,0 +1,35 @@
+"""
+Aplica aos UserSets os deltas de curtidas/favoritos do modo write-behind
+
+Uso:
+    python manage.py flush_set_counters
+    python manage.py flush_set_counters --interval 10
+
+Só tem efeito com USERSET_COUNTERS_WRITE_BEHIND ligado (ver armory.counters).
+Sem --interval roda uma vez (para agendamento); com ele fica em laço, como
+processo de fundo. Várias instâncias podem rodar juntas (lotes travados são
+pulados).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from armory.counters import flush_pending_counters
+
+
+class Command(BaseCommand):
+    help = 'Aplica em lote os deltas pendentes dos contadores de curtidas/favoritos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Deltas por lote (padrão: 10000)')
+        parser.add_argument('--interval', type=float, help='Repete a cada N segundos até ser interrompido')
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = flush_pending_counters(batch_size=options['batch_size'])
+            if flushed or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(f'{flushed} deltas aplicados.'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
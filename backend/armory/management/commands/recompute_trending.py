@@ -0,0 +1,29 @@
+"""
+Atualiza o ranking de tendência dos sets da comunidade (?ordering=trending)
+
+Uso:
+    python manage.py recompute_trending
+    python manage.py recompute_trending --full
+
+Deve rodar de hora em hora (ver armory.trending). --full reagrega a janela
+inteira a partir das curtidas/favoritos, útil após o deploy ou um seed.
+"""
+
+from django.core.management.base import BaseCommand
+
+from armory.trending import prune_activity, recompute_trending_scores, rollup_activity
+
+
+class Command(BaseCommand):
+    help = 'Agrega curtidas/favoritos por hora e recalcula o trending_score dos UserSets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Reagrega a janela inteira (padrão: só horas novas)')
+
+    def handle(self, *args, **options):
+        rows = rollup_activity(full=options['full'])
+        scored = recompute_trending_scores()
+        pruned = prune_activity()
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows} agregados por hora gravados, {scored} sets pontuados, {pruned} agregados antigos removidos.'
+        ))
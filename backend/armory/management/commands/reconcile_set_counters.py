@@ -0,0 +1,37 @@
+"""
+Recalcula likes_count, favorites_count e popularity dos UserSets
+
+Uso:
+    python manage.py reconcile_set_counters
+    python manage.py reconcile_set_counters --dry-run
+    python manage.py reconcile_set_counters --public-only --batch-size 5000
+
+Os contadores são mantidos pelos sinais de m2m_changed; escritas diretas nas
+tabelas de curtidas/favoritos (seed, SQL manual, exclusão de usuários) os
+deixam divergentes. Seguro de rodar com o site no ar (ver armory.counters).
+"""
+
+from django.core.management.base import BaseCommand
+
+from armory.counters import reconcile_counters
+from armory.models import UserSet
+
+
+class Command(BaseCommand):
+    help = 'Corrige contadores de curtidas/favoritos divergentes nos UserSets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Sets por lote (padrão: 10000)')
+        parser.add_argument('--public-only', action='store_true', help='Apenas sets públicos')
+        parser.add_argument('--dry-run', action='store_true', help='Só conta os divergentes, sem corrigir')
+
+    def handle(self, *args, **options):
+        queryset = UserSet.objects.filter(is_public=True) if options['public_only'] else UserSet.objects.all()
+        drifted = reconcile_counters(queryset, batch_size=options['batch_size'], dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted} sets com contadores divergentes.')
+        elif drifted:
+            self.stdout.write(self.style.SUCCESS(f'{drifted} sets corrigidos.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Nenhum contador divergente.'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('armory', '0019_userset_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='passive',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='passive',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
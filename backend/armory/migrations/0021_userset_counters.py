@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    UserSet = apps.get_model('armory', 'UserSet')
+
+    def total(relation):
+        through = UserSet._meta.get_field(relation).remote_field.through
+        rows = through.objects.filter(userset_id=OuterRef('pk')).order_by().values('userset_id')
+        return Coalesce(Subquery(rows.annotate(total=Count('pk')).values('total')), 0)
+
+    UserSet.objects.update(likes_count=total('likes'), favorites_count=total('favorites'))
+    UserSet.objects.update(popularity=F('likes_count') + F('favorites_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('armory', '0020_passive_created_at_passive_updated_at'),
+        ('booster', '0003_userboosterrelation'),
+        ('stratagems', '0007_stratagem_warbond'),
+        ('weaponry', '0007_primaryweapon_created_at_primaryweapon_updated_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userset',
+            name='favorites_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Total de Favoritos'),
+        ),
+        migrations.AddField(
+            model_name='userset',
+            name='likes_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Total de Curtidas'),
+        ),
+        migrations.AddField(
+            model_name='userset',
+            name='popularity',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Popularidade'),
+        ),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-popularity', '-created_at'], name='userset_public_popularity_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
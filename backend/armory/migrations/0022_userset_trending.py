@@ -0,0 +1,110 @@
+# Generated by Django 5.2.7 on 2026-10-17 05:10
+
+from datetime import timedelta
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Least
+
+# Votos existentes não têm data: ficam com a do set, mas sempre fora da janela
+# do ranking (armory.trending.WINDOW, 7 dias), senão o trending da primeira
+# semana repetiria a popularidade acumulada
+BACKFILL_AGE = timedelta(days=8)
+
+
+def backfill_vote_dates(apps, schema_editor):
+    UserSet = apps.get_model('armory', 'UserSet')
+    cutoff = django.utils.timezone.now() - BACKFILL_AGE
+    set_created_at = models.Subquery(
+        UserSet.objects.filter(pk=models.OuterRef('userset_id')).values('created_at')[:1]
+    )
+    for name in ('UserSetLike', 'UserSetFavorite'):
+        apps.get_model('armory', name).objects.update(
+            created_at=Least(set_created_at, models.Value(cutoff, output_field=models.DateTimeField()))
+        )
+
+
+def _vote_model(name, db_table, verbose_name, verbose_name_plural):
+    # Mesmo formato da tabela automática do M2M: só o estado muda aqui
+    return migrations.CreateModel(
+        name=name,
+        fields=[
+            ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ('userset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='armory.userset')),
+            ('customuser', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+        ],
+        options={
+            'verbose_name': verbose_name,
+            'verbose_name_plural': verbose_name_plural,
+            'db_table': db_table,
+            'abstract': False,
+            'unique_together': {('userset', 'customuser')},
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('armory', '0021_userset_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # As tabelas armory_userset_likes/favorites já existem (M2M automático):
+        # passam a ser modelos explícitos sem recriar nada no banco
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                _vote_model('UserSetLike', 'armory_userset_likes', 'Curtida', 'Curtidas'),
+                _vote_model('UserSetFavorite', 'armory_userset_favorites', 'Favorito', 'Favoritos'),
+                migrations.AlterField(
+                    model_name='userset',
+                    name='likes',
+                    field=models.ManyToManyField(blank=True, related_name='liked_sets', through='armory.UserSetLike', to=settings.AUTH_USER_MODEL, verbose_name='Curtidas'),
+                ),
+                migrations.AlterField(
+                    model_name='userset',
+                    name='favorites',
+                    field=models.ManyToManyField(blank=True, related_name='favorite_sets', through='armory.UserSetFavorite', to=settings.AUTH_USER_MODEL, verbose_name='Favoritos'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='usersetlike',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='usersetfavorite',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_vote_dates, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='userset',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='Pontuação de Tendência'),
+        ),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-trending_score', '-created_at'], name='userset_public_trending_idx'),
+        ),
+        migrations.CreateModel(
+            name='UserSetActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='Hora (início)')),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('favorites', models.PositiveIntegerField(default=0)),
+                ('user_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='armory.userset')),
+            ],
+            options={
+                'verbose_name': 'Atividade por Hora',
+                'verbose_name_plural': 'Atividade por Hora',
+                'indexes': [models.Index(fields=['hour'], name='usersetactivity_hour_idx')],
+                'unique_together': {('user_set', 'hour')},
+            },
+        ),
+    ]
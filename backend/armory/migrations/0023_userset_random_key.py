@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:30
+
+import armory.models.user_set
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Random
+
+
+def backfill_random_key(apps, schema_editor):
+    # O AddField grava um único valor do default em todas as linhas existentes
+    UserSet = apps.get_model('armory', 'UserSet')
+    UserSet.objects.update(random_key=Random())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('armory', '0022_userset_trending'),
+        ('booster', '0003_userboosterrelation'),
+        ('stratagems', '0007_stratagem_warbond'),
+        ('weaponry', '0007_primaryweapon_created_at_primaryweapon_updated_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userset',
+            name='random_key',
+            field=models.FloatField(default=armory.models.user_set.random_sort_key, editable=False, verbose_name='Chave Aleatória'),
+        ),
+        migrations.RunPython(backfill_random_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['random_key', 'id'], name='userset_public_random_idx'),
+        ),
+    ]
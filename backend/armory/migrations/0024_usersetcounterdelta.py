@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('armory', '0023_userset_random_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSetCounterDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.SmallIntegerField(default=0)),
+                ('favorites', models.SmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_counter_deltas', to='armory.userset')),
+            ],
+            options={
+                'verbose_name': 'Delta de Contador Pendente',
+                'verbose_name_plural': 'Deltas de Contadores Pendentes',
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('armory', '0024_usersetcounterdelta'),
+        ('booster', '0003_userboosterrelation'),
+        ('stratagems', '0007_stratagem_warbond'),
+        ('weaponry', '0007_primaryweapon_created_at_primaryweapon_updated_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='userset',
+            name='userset_public_popularity_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userset',
+            name='userset_public_trending_idx',
+        ),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-popularity', '-created_at', '-id'], name='userset_public_popularity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-trending_score', '-created_at', '-id'], name='userset_public_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-created_at', '-id'], name='userset_public_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userset',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='userset_user_recent_idx'),
+        ),
+    ]
@@ -5,7 +5,7 @@ from .cape import Cape
 from .set import ArmorSet
 from .user_set_relation import UserArmorSetRelation
 from .user_component_relations import UserHelmetRelation, UserArmorRelation, UserCapeRelation
-from .user_set import UserSet
+from .user_set import UserSet, UserSetLike, UserSetFavorite, UserSetActivity, UserSetCounterDelta
 
 
 __all__ = [
@@ -19,4 +19,8 @@ __all__ = [
     'UserArmorRelation',
     'UserCapeRelation',
     'UserSet',
+    'UserSetLike',
+    'UserSetFavorite',
+    'UserSetActivity',
+    'UserSetCounterDelta',
 ]
\ No newline at end of file
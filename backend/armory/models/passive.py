@@ -30,6 +30,9 @@ class Passive(models.Model):
         verbose_name="Imagem"
     )
     
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
     class Meta:
         verbose_name = "Passiva"
         verbose_name_plural = "Passivas"
@@ -1,5 +1,8 @@
+import random
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from .helmet import Helmet
 from .armor import Armor
 from .cape import Cape
@@ -7,6 +10,12 @@ from weaponry.models import PrimaryWeapon, SecondaryWeapon, Throwable
 from booster.models import Booster
 from stratagems.models import Stratagem
 
+
+def random_sort_key():
+    """Chave uniforme em [0, 1) da ordenação aleatória com semente"""
+    return random.random()
+
+
 class UserSet(models.Model):
     """Conjunto de armadura criado pelo usuário (Loadout)"""
     
@@ -98,9 +107,10 @@ class UserSet(models.Model):
         verbose_name="Público?"
     )
     
-    # Likes
+    # Likes (tabelas intermediárias com data, usadas pelo trending)
     likes = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through='UserSetLike',
         related_name='liked_sets',
         blank=True,
         verbose_name="Curtidas"
@@ -108,11 +118,21 @@ class UserSet(models.Model):
 
     favorites = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through='UserSetFavorite',
         related_name='favorite_sets',
         blank=True,
         verbose_name="Favoritos"
     )
     
+    # Contadores desnormalizados (mantidos pelos sinais de m2m_changed; ver armory.counters)
+    likes_count = models.IntegerField(default=0, editable=False, verbose_name="Total de Curtidas")
+    favorites_count = models.IntegerField(default=0, editable=False, verbose_name="Total de Favoritos")
+    popularity = models.IntegerField(default=0, editable=False, verbose_name="Popularidade")
+    # Curtidas/favoritos recentes com decaimento exponencial (recalculado por recompute_trending)
+    trending_score = models.FloatField(default=0, editable=False, verbose_name="Pontuação de Tendência")
+    # Ordenação aleatória com semente (common.shuffle)
+    random_key = models.FloatField(default=random_sort_key, editable=False, verbose_name="Chave Aleatória")
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -120,10 +140,102 @@ class UserSet(models.Model):
         verbose_name = "Set de Usuário"
         verbose_name_plural = "Sets de Usuário"
         ordering = ['-created_at']
+        indexes = [
+            # Ordenações da comunidade servidas por varredura de índice, com o id como
+            # desempate do cursor (common.pagination.KeysetPagination)
+            models.Index(
+                fields=['-popularity', '-created_at', '-id'],
+                name='userset_public_popularity_idx',
+                condition=models.Q(is_public=True),
+            ),
+            models.Index(
+                fields=['-trending_score', '-created_at', '-id'],
+                name='userset_public_trending_idx',
+                condition=models.Q(is_public=True),
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='userset_public_recent_idx',
+                condition=models.Q(is_public=True),
+            ),
+            models.Index(
+                fields=['random_key', 'id'],
+                name='userset_public_random_idx',
+                condition=models.Q(is_public=True),
+            ),
+            # Meus Sets
+            models.Index(fields=['user', '-created_at', '-id'], name='userset_user_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} por {self.user.username}"
     
     @property
     def total_likes(self):
-        return self.likes.count()
+        return self.likes_count
+
+
+class UserSetVote(models.Model):
+    """
+    Base das tabelas intermediárias de curtidas/favoritos. Os nomes dos campos
+    (userset/customuser) mantêm as colunas das antigas tabelas automáticas.
+    """
+
+    userset = models.ForeignKey(UserSet, on_delete=models.CASCADE)
+    customuser = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        abstract = True
+        unique_together = [('userset', 'customuser')]
+
+    def __str__(self):
+        return f"{self.customuser_id} -> {self.userset_id}"
+
+
+class UserSetLike(UserSetVote):
+    class Meta(UserSetVote.Meta):
+        db_table = 'armory_userset_likes'
+        verbose_name = "Curtida"
+        verbose_name_plural = "Curtidas"
+
+
+class UserSetFavorite(UserSetVote):
+    class Meta(UserSetVote.Meta):
+        db_table = 'armory_userset_favorites'
+        verbose_name = "Favorito"
+        verbose_name_plural = "Favoritos"
+
+
+class UserSetActivity(models.Model):
+    """Curtidas/favoritos ganhos por set em cada hora (agregado por recompute_trending)"""
+
+    user_set = models.ForeignKey(UserSet, on_delete=models.CASCADE, related_name='activity')
+    hour = models.DateTimeField(verbose_name="Hora (início)")
+    likes = models.PositiveIntegerField(default=0)
+    favorites = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Atividade por Hora"
+        verbose_name_plural = "Atividade por Hora"
+        unique_together = [('user_set', 'hour')]
+        indexes = [models.Index(fields=['hour'], name='usersetactivity_hour_idx')]
+
+    def __str__(self):
+        return f"{self.user_set_id} @ {self.hour:%Y-%m-%d %H:00}"
+
+
+class UserSetCounterDelta(models.Model):
+    """Variação pendente dos contadores de um set (modo write-behind, ver armory.counters)"""
+
+    user_set = models.ForeignKey(UserSet, on_delete=models.CASCADE, related_name='pending_counter_deltas')
+    likes = models.SmallIntegerField(default=0)
+    favorites = models.SmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Delta de Contador Pendente"
+        verbose_name_plural = "Deltas de Contadores Pendentes"
+
+    def __str__(self):
+        return f"{self.user_set_id}: {self.likes:+d} curtidas, {self.favorites:+d} favoritos"
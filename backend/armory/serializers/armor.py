@@ -2,13 +2,14 @@ from rest_framework import serializers
 from armory.models import Armor
 from .passive import PassiveSerializer
 from warbonds.serializers import WarbondSerializer, AcquisitionSourceSerializer
+from common.store import CatalogRelatedField
 
 
 
 class ArmorSerializer(serializers.ModelSerializer):
-    passive_detail = PassiveSerializer(source='passive', read_only=True)
-    pass_detail = WarbondSerializer(source='pass_field', read_only=True)
-    acquisition_source_detail = AcquisitionSourceSerializer(source='acquisition_source', read_only=True)
+    passive_detail = CatalogRelatedField(PassiveSerializer(), source='passive')
+    pass_detail = CatalogRelatedField(WarbondSerializer(), source='pass_field')
+    acquisition_source_detail = CatalogRelatedField(AcquisitionSourceSerializer(), source='acquisition_source')
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     source_display = serializers.CharField(source='get_source_display', read_only=True)
     cost_currency = serializers.CharField(source='get_cost_currency', read_only=True)
@@ -1,12 +1,13 @@
 from rest_framework import serializers
 from armory.models import Cape
 from warbonds.serializers import WarbondSerializer, AcquisitionSourceSerializer
+from common.store import CatalogRelatedField
 
 
 
 class CapeSerializer(serializers.ModelSerializer):
-    pass_detail = WarbondSerializer(source='pass_field', read_only=True)
-    acquisition_source_detail = AcquisitionSourceSerializer(source='acquisition_source', read_only=True)
+    pass_detail = CatalogRelatedField(WarbondSerializer(), source='pass_field')
+    acquisition_source_detail = CatalogRelatedField(AcquisitionSourceSerializer(), source='acquisition_source')
     source_display = serializers.CharField(source='get_source_display', read_only=True)
     cost_currency = serializers.CharField(source='get_cost_currency', read_only=True)
     
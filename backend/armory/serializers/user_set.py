@@ -1,5 +1,7 @@
+from django.db.models import Manager
 from rest_framework import serializers
-from armory.models import UserSet
+from armory.counters import pending_deltas
+from armory.models import UserSet, UserSetLike, UserSetFavorite
 from .helmet import HelmetSerializer
 from .armor import ArmorSerializer
 from .cape import CapeSerializer
@@ -9,6 +11,24 @@ from weaponry.serializers import PrimaryWeaponSerializer, SecondaryWeaponSeriali
 from booster.serializers import BoosterSerializer
 from stratagems.serializers import StratagemSerializer
 
+# Campo de estado do visitante -> (tabela de votos, relação no UserSet)
+VIEWER_STATE_FIELDS = {
+    'is_liked': (UserSetLike, 'likes'),
+    'is_favorited': (UserSetFavorite, 'favorites'),
+}
+
+
+class ViewerStateListSerializer(serializers.ListSerializer):
+    """Resolve is_liked/is_favorited (e contadores pendentes) da página inteira de uma vez"""
+
+    def to_representation(self, data):
+        user_sets = list(data.all() if isinstance(data, Manager) else data)
+        self.child.resolve_viewer_state(user_sets)
+        if 'like_count' in self.child.fields:
+            self.context['pending_counters'] = pending_deltas([user_set.pk for user_set in user_sets])
+        return super().to_representation(user_sets)
+
+
 class UserSetSerializer(serializers.ModelSerializer):
     helmet_detail = HelmetSerializer(source='helmet', read_only=True)
     armor_detail = ArmorSerializer(source='armor', read_only=True)
@@ -45,31 +65,57 @@ class UserSetSerializer(serializers.ModelSerializer):
             'creator_username', 'user'
         ]
         read_only_fields = ['user', 'created_at', 'likes', 'favorites']
-        
-    def get_is_liked(self, obj):
+        # O que cada SerializerMethodField lê (poda do queryset em ?fields=/?omit=)
+        method_field_sources = {
+            'is_liked': ('likes',),
+            'like_count': ('likes_count',),
+            'is_favorited': ('favorites',),
+            'is_mine': ('user',),
+        }
+        list_serializer_class = ViewerStateListSerializer
+
+    def resolve_viewer_state(self, user_sets):
+        """Guarda no contexto os ids (entre `user_sets`) curtidos/favoritados pelo visitante"""
         user = self.context['request'].user
-        if user.is_authenticated:
-            return obj.likes.filter(id=user.id).exists()
-        return False
+        if not user.is_authenticated or not user_sets:
+            return
+        set_ids = [user_set.pk for user_set in user_sets]
+        state = self.context.setdefault('viewer_state', {})
+        for field_name, (model, _) in VIEWER_STATE_FIELDS.items():
+            if field_name in self.fields:
+                state[field_name] = set(
+                    model.objects.filter(customuser=user, userset_id__in=set_ids).values_list('userset_id', flat=True)
+                )
 
-    def get_is_favorited(self, obj):
+    def viewer_has(self, obj, field_name):
         user = self.context['request'].user
-        if user.is_authenticated:
-            return obj.favorites.filter(id=user.id).exists()
-        return False
+        if not user.is_authenticated:
+            return False
+        resolved = self.context.get('viewer_state', {}).get(field_name)
+        if resolved is not None:
+            return obj.pk in resolved
+        # Fora de listagens (detalhe, create/update): consulta só este set
+        _, relation = VIEWER_STATE_FIELDS[field_name]
+        return getattr(obj, relation).filter(id=user.id).exists()
+
+    def get_is_liked(self, obj):
+        return self.viewer_has(obj, 'is_liked')
+
+    def get_is_favorited(self, obj):
+        return self.viewer_has(obj, 'is_favorited')
         
     def get_is_mine(self, obj):
         user = self.context['request'].user
         if user.is_authenticated:
-            return obj.user == user
+            return obj.user_id == user.id
         return False
 
     def get_like_count(self, obj):
-        # Usa o valor anotado se disponível (otimizado no list)
-        if hasattr(obj, 'likes_count'):
-            return obj.likes_count
-        # Fallback para query (detail/create)
-        return obj.likes.count()
+        # Contador desnormalizado + o que ainda está no buffer de write-behind (ver armory.counters)
+        pending = self.context.get('pending_counters')
+        if pending is None:
+            pending = pending_deltas([obj.pk])
+        return obj.likes_count + pending.get(obj.pk, {}).get('likes', 0)
         
     def create(self, validated_data):
         # Ensure user is set from request
@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
+from .counters import COUNTER_COLUMNS, adjust_counters, through_fields
 from .models import (
     ArmorSet,
+    UserSet,
     UserArmorSetRelation,
     UserHelmetRelation,
     UserArmorRelation,
@@ -217,3 +219,49 @@ def _safe_delete_set(user, set_ids, relation_type):
         ).delete()
     finally:
         post_delete.connect(sync_delete_components_from_set, sender=UserArmorSetRelation)
+
+
+# ==============================================================================
+# CONTADORES DE CURTIDAS/FAVORITOS (ver armory.counters)
+# ==============================================================================
+
+def _counter_deltas(relation, instance, action, reverse, pk_set, using):
+    """{set_id: delta} de um add/remove/clear, do lado do set ou do usuário"""
+    through, set_field, user_field = through_fields(relation)
+
+    if action == 'post_add':
+        # No post_add o pk_set contém apenas as linhas realmente inseridas
+        if reverse:
+            return {set_id: 1 for set_id in pk_set}
+        return {instance.pk: len(pk_set)}
+
+    # pre_remove/pre_clear: conta o que de fato existe antes de apagar
+    rows = through.objects.using(using)
+    if reverse:
+        rows = rows.filter(**{f'{user_field}_id': instance.pk})
+        if pk_set is not None:
+            rows = rows.filter(**{f'{set_field}_id__in': pk_set})
+        return {set_id: -1 for set_id in rows.values_list(f'{set_field}_id', flat=True)}
+    rows = rows.filter(**{f'{set_field}_id': instance.pk})
+    if pk_set is not None:
+        rows = rows.filter(**{f'{user_field}_id__in': pk_set})
+    return {instance.pk: -rows.count()}
+
+
+def _make_counter_handler(relation):
+    def handler(sender, instance, action, reverse, pk_set, using, **kwargs):
+        if action not in ('post_add', 'pre_remove', 'pre_clear'):
+            return
+        # O Django já envolve o sinal e a escrita no M2M na mesma transação
+        adjust_counters(relation, _counter_deltas(relation, instance, action, reverse, pk_set, using), using)
+    handler.__name__ = f'update_{relation}_counters'
+    return handler
+
+
+for _relation in COUNTER_COLUMNS:
+    m2m_changed.connect(
+        _make_counter_handler(_relation),
+        sender=getattr(UserSet, _relation).through,
+        weak=False,
+        dispatch_uid=f'armory.userset.{_relation}_counters',
+    )
@@ -1,3 +1,316 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from armory.counters import flush_pending_counters
+from armory.models import UserSet, UserSetActivity, UserSetCounterDelta, UserSetLike, UserSetFavorite
+from armory.trending import prune_activity, recompute_trending_scores, rollup_activity
+from common.shuffle import SeededOrder
+from common.testing import QueryBudgetMixin, seed_catalog, seed_user_sets
+
+User = get_user_model()
+
+
+class ArmoryQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Orçamento de queries dos endpoints do armory (falha se um N+1 voltar)"""
+
+    def setUp(self):
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog = seed_catalog()
+        self.warm_catalog_store()
+
+    def test_component_lists(self):
+        """Testa se as listagens de componentes não fazem uma query por item"""
+        # Versão + count + página de IDs + versão do store
+        for url in ('/api/v1/armory/armors/', '/api/v1/armory/helmets/',
+                    '/api/v1/armory/capes/', '/api/v1/armory/passives/'):
+            self.assertWithinBudget(url, 4)
+
+    def test_armor_set_list_and_detail(self):
+        """Testa ArmorSetListSerializer aninhando ArmorSerializer e WarbondSerializer"""
+        response = self.assertWithinBudget('/api/v1/armory/sets/', 4)
+        self.assertIsNotNone(response.data['results'][0]['armor_detail']['pass_detail'])
+        self.assertWithinBudget(f'/api/v1/armory/sets/{self.catalog["sets"][0].id}/', 2)
+
+    def test_armor_detail(self):
+        """Testa o detalhe da armadura com passiva, warbond e fonte aninhados"""
+        self.assertWithinBudget(f'/api/v1/armory/armors/{self.catalog["armors"][0].id}/', 2)
+
+
+class UserSetQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Orçamento dos sets da comunidade (UserSetSerializer com stratagems_detail).
+
+    Com o plano de prefetch (common.prefetch) e a paginação por cursor o custo
+    não depende do tamanho nem da profundidade da página: página (com joins) +
+    estratagemas + versão do store, sem COUNT(*).
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog = seed_catalog()
+        self.users = [
+            User.objects.create_user(username=f'diver{i}', email=f'diver{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        self.user_sets = seed_user_sets(self.users, self.catalog)
+        self.warm_catalog_store()
+
+    def test_community_list_anonymous(self):
+        """Testa a listagem pública da comunidade sem autenticação"""
+        self.assertWithinBudget('/api/v1/armory/community-sets/?mode=community', 3)
+
+    def test_community_list_does_not_grow_with_page(self):
+        """Testa se dobrar os sets da página não muda o número de queries"""
+        seed_user_sets(self.users, self.catalog)
+        response = self.assertWithinBudget('/api/v1/armory/community-sets/?mode=community', 3)
+        self.assertEqual(len(response.data['results']), 2 * len(self.user_sets))
+        loadout = response.data['results'][0]
+        self.assertIsNotNone(loadout['primary_detail']['acquisition_source_detail'])
+        self.assertIsNotNone(loadout['stratagems_detail'][0]['warbond_detail'])
+
+    def walk_cursor(self, url, max_queries):
+        """Segue os links next a partir de `url`; retorna os ids vistos na ordem"""
+        seen, pages = [], []
+        while url:
+            response = self.assertWithinBudget(url, max_queries)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+
+        # Voltando pelo previous a partir da última página
+        back = self.client.get(pages[-1]['previous']).data
+        self.assertEqual([row['id'] for row in back['results']], [row['id'] for row in pages[-2]['results']])
+        return seen
+
+    def test_cursor_walk_is_complete_and_flat(self):
+        """Testa se o cursor percorre todos os sets (com empates de popularidade) ao mesmo custo por página"""
+        expected = list(
+            UserSet.objects.filter(is_public=True).order_by('-popularity', '-created_at', '-id').values_list('id', flat=True)
+        )
+        seen = self.walk_cursor('/api/v1/armory/community-sets/?mode=community&ordering=smart&page_size=2', 3)
+        self.assertEqual(seen, expected)
+        response = self.client.get('/api/v1/armory/community-sets/?mode=community&cursor=bm9wZQ')
+        self.assertEqual(response.status_code, 404)
+
+    def test_random_cursor_walk_is_complete_and_flat(self):
+        """Testa se o cursor da ordem aleatória percorre todos os sets uma vez, ao mesmo custo por página"""
+        order = SeededOrder('abc')
+        rows = UserSet.objects.filter(is_public=True).values_list('random_key', 'id')
+        expected = [pk for _, pk in sorted(rows, key=lambda row: order.sort_key(*row))]
+        # Uma varredura (chave, pk) por faixa da semente + página + estratagemas + versão do store
+        url = '/api/v1/armory/community-sets/?mode=community&ordering=random&seed=abc&page_size=2'
+        seen = self.walk_cursor(url, len(order.ranges) + 3)
+        self.assertEqual(seen, expected)
+
+    def test_community_list_authenticated(self):
+        """Testa a listagem da comunidade com is_liked/is_favorited do usuário"""
+        # Estado do visitante resolvido por página: +1 query por relação
+        self.user_sets[0].likes.remove(self.users[0])
+        self.client.force_authenticate(self.users[0])
+        response = self.assertWithinBudget('/api/v1/armory/community-sets/?mode=community', 5)
+        liked = {row['id']: row['is_liked'] for row in response.data['results']}
+        self.assertEqual(liked, {user_set.id: user_set != self.user_sets[0] for user_set in self.user_sets})
+        self.assertTrue(all(row['is_favorited'] for row in response.data['results']))
+        self.assertWithinBudget('/api/v1/armory/community-sets/?mode=favorites', 5)
+        self.assertWithinBudget('/api/v1/armory/community-sets/', 5)
+
+    def test_community_detail(self):
+        """Testa o detalhe de um set com o loadout completo"""
+        self.client.force_authenticate(self.users[0])
+        self.assertWithinBudget(f'/api/v1/armory/community-sets/{self.user_sets[0].id}/', 5)
+
+
+class UserSetCounterTests(TestCase):
+    """Contadores desnormalizados de curtidas/favoritos (armory.counters)"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(username=f'counter{i}', email=f'counter{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        self.user_sets = seed_user_sets(self.users[:1], seed_catalog(rows=2))
+
+    def counters(self, user_set):
+        user_set.refresh_from_db()
+        return user_set.likes_count, user_set.favorites_count, user_set.popularity
+
+    def test_toggles_and_m2m_writes_keep_counters(self):
+        """Testa se like/favorite e escritas no M2M (dos dois lados) atualizam contadores e popularidade"""
+        user_set = self.user_sets[0]
+        self.assertEqual(self.counters(user_set), (1, 1, 2))
+
+        self.client.force_authenticate(self.users[1])
+        response = self.client.post(f'/api/v1/armory/community-sets/{user_set.id}/like/?mode=community')
+        self.assertEqual(response.data['total_likes'], 2)
+        self.client.post(f'/api/v1/armory/community-sets/{user_set.id}/favorite/?mode=community')
+        self.assertEqual(self.counters(user_set), (2, 2, 4))
+
+        self.users[2].liked_sets.add(*self.user_sets)
+        self.users[2].liked_sets.add(user_set)  # repetido: não conta de novo
+        self.assertEqual(self.counters(user_set), (3, 2, 5))
+        self.users[2].liked_sets.clear()
+        user_set.favorites.remove(self.users[1], self.users[2])  # users[2] nunca favoritou
+        self.assertEqual(self.counters(user_set), (2, 1, 3))
+
+    def test_toggle_cost_does_not_grow_with_likers(self):
+        """Testa se o toggle custa o mesmo em um set com muitas curtidas"""
+        quiet, popular = self.user_sets
+        popular.likes.add(*User.objects.bulk_create([
+            User(username=f'fan{i}', email=f'fan{i}@example.com') for i in range(30)
+        ]))
+        self.client.force_authenticate(self.users[1])
+
+        costs = []
+        for user_set in (quiet, popular):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(f'/api/v1/armory/community-sets/{user_set.id}/like/?mode=community')
+            costs.append(len(queries))
+            self.assertEqual(response.data['liked'], True)
+            self.assertEqual(response.data['total_likes'], user_set.likes.count())
+        self.assertEqual(costs[0], costs[1])
+
+        response = self.client.post(f'/api/v1/armory/community-sets/{popular.id}/like/?mode=community')
+        self.assertEqual((response.data['liked'], response.data['total_likes']), (False, 31))
+        self.assertEqual(self.counters(popular), (31, 1, 32))
+
+    @override_settings(USERSET_COUNTERS_WRITE_BEHIND=True)
+    def test_write_behind_buffers_until_flush(self):
+        """Testa se no write-behind o voto fica no buffer, aparece nas leituras e é aplicado pelo flush"""
+        user_set = self.user_sets[0]
+        self.client.force_authenticate(self.users[1])
+        response = self.client.post(f'/api/v1/armory/community-sets/{user_set.id}/like/?mode=community')
+        self.assertEqual(response.data['total_likes'], 2)
+        self.client.post(f'/api/v1/armory/community-sets/{user_set.id}/favorite/?mode=community')
+        self.assertEqual(self.counters(user_set), (1, 1, 2))  # linha do set intocada
+
+        response = self.client.get(f'/api/v1/armory/community-sets/?mode=community&fields=id,like_count,is_liked')
+        row = next(row for row in response.data['results'] if row['id'] == user_set.id)
+        self.assertEqual((row['like_count'], row['is_liked']), (2, True))
+        output = StringIO()
+        call_command('reconcile_set_counters', '--dry-run', stdout=output)
+        self.assertIn('0 sets', output.getvalue())  # o pendente não conta como divergência
+
+        self.assertEqual(flush_pending_counters(), 2)
+        self.assertEqual(self.counters(user_set), (2, 2, 4))
+        self.assertFalse(UserSetCounterDelta.objects.exists())
+
+    def test_smart_sort_uses_popularity(self):
+        """Testa se a ordenação smart segue a coluna de popularidade"""
+        least_popular = self.user_sets[1]
+        least_popular.likes.add(*self.users[1:])
+        response = self.client.get('/api/v1/armory/community-sets/?mode=community&ordering=smart')
+        self.assertEqual(response.data['results'][0]['id'], least_popular.id)
+
+    def test_reconcile_repairs_drift(self):
+        """Testa se o reconcile_set_counters corrige contadores divergentes"""
+        UserSet.objects.update(likes_count=10, popularity=0)
+        output = StringIO()
+        call_command('reconcile_set_counters', '--dry-run', stdout=output)
+        self.assertIn('2 sets', output.getvalue())
+
+        call_command('reconcile_set_counters', stdout=StringIO())
+        self.assertEqual([self.counters(user_set) for user_set in self.user_sets], [(1, 1, 2), (1, 1, 2)])
+
+
+class UserSetTrendingTests(TestCase):
+    """Ranking de tendência com decaimento (armory.trending)"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(username=f'trend{i}', email=f'trend{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        self.user_sets = seed_user_sets(self.users[:1], seed_catalog(rows=2))
+        # Referência uma hora à frente: os votos do setUp caem numa hora fechada
+        self.now = timezone.now() + timedelta(hours=1)
+
+    def test_recent_activity_outranks_older_popularity(self):
+        """Testa se votos recentes superam votos mais numerosos porém antigos, e se a janela expira"""
+        old_set, recent_set = self.user_sets
+        old_set.likes.add(*self.users[1:])
+        days_ago = self.now - timedelta(days=5)
+        for model in (UserSetLike, UserSetFavorite):
+            model.objects.filter(userset=old_set).update(created_at=days_ago)
+
+        rollup_activity(self.now)
+        self.assertEqual(recompute_trending_scores(self.now), 2)
+        response = self.client.get('/api/v1/armory/community-sets/?mode=community&ordering=trending')
+        self.assertEqual([row['id'] for row in response.data['results']], [recent_set.id, old_set.id])
+        response = self.client.get('/api/v1/armory/community-sets/?mode=community&ordering=smart')
+        self.assertEqual(response.data['results'][0]['id'], old_set.id)
+
+        # Rodar de novo na mesma hora não duplica os agregados
+        rollup_activity(self.now)
+        self.assertEqual(UserSetActivity.objects.filter(user_set=old_set).count(), 1)
+
+        later = self.now + timedelta(days=8)
+        rollup_activity(later)
+        self.assertEqual(recompute_trending_scores(later), 0)
+        self.assertEqual(prune_activity(later), 2)
+        self.assertFalse(UserSet.objects.filter(trending_score__gt=0).exists())
+
+
+class UserSetRandomOrderingTests(TestCase):
+    """Ordenação aleatória com semente (common.shuffle)"""
+
+    url = '/api/v1/armory/community-sets/?mode=community&ordering=random'
+
+    def setUp(self):
+        self.client = APIClient()
+        owner = User.objects.create_user(username='shuffle', email='shuffle@example.com', password='x')
+        self.user_sets = seed_user_sets([owner], seed_catalog(rows=6))
+        # Chaves espalhadas (0.05 ... 0.88), fixas para a ordem não depender do sorteio
+        for index, user_set in enumerate(self.user_sets):
+            UserSet.objects.filter(pk=user_set.pk).update(random_key=index / 6 + 0.05)
+
+    def expected(self, seed):
+        order = SeededOrder(seed)
+        rows = UserSet.objects.filter(is_public=True).values_list('random_key', 'id')
+        return [pk for _, pk in sorted(rows, key=lambda row: order.sort_key(*row))]
+
+    def ids(self, url):
+        return [row['id'] for row in self.client.get(url).data['results']]
+
+    def test_seed_gives_stable_order(self):
+        """Testa se a mesma semente repete a ordem e se outra semente não é só uma rotação dela"""
+        abc = self.ids(f'{self.url}&seed=abc')
+        self.assertEqual(abc, self.expected('abc'))
+        self.assertEqual(self.ids(f'{self.url}&seed=abc&fields=id'), abc)
+
+        xyz = self.ids(f'{self.url}&seed=xyz')
+        self.assertEqual(xyz, self.expected('xyz'))
+        self.assertFalse(any(abc[index:] + abc[:index] == xyz for index in range(len(abc))))
+
+    def test_seeds_with_same_band_count_are_not_rotations(self):
+        """Testa se sementes com o mesmo número de faixas dão ordens diferentes, não rotações"""
+        self.assertEqual(len(SeededOrder('abc').ranges), len(SeededOrder('c').ranges))
+        abc = self.ids(f'{self.url}&seed=abc')
+        other = self.ids(f'{self.url}&seed=c')
+        self.assertEqual(other, self.expected('c'))
+        self.assertFalse(any(abc[index:] + abc[:index] == other for index in range(len(abc))))
+
+    def test_pages_are_range_scans(self):
+        """Testa se cada página faz uma varredura por faixa da semente, sem COUNT, OFFSET ou ORDER BY RANDOM()"""
+        ranges = len(SeededOrder('abc').ranges)
+        url = f'{self.url}&seed=abc&fields=id&page_size=4'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            # Faixas + página por pk
+            self.assertEqual(len(queries), ranges + 1)
+            for query in queries.captured_queries:
+                self.assertNotRegex(query['sql'].upper(), r'COUNT\(|OFFSET|RANDOM\(')
+            url = response.data['next']
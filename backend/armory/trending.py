@@ -0,0 +1,104 @@
+"""
+Ranking de tendência (?ordering=trending) dos sets da comunidade
+
+Curtidas/favoritos têm data (UserSetLike/UserSetFavorite.created_at). Um job
+de hora em hora (recompute_trending):
+
+1. agrega as horas fechadas em UserSetActivity (set, hora, curtidas, favoritos);
+2. recalcula UserSet.trending_score a partir da janela de WINDOW, com cada hora
+   pesando 0.5 ** (idade / HALF_LIFE) -- a última hora vale 1, a de 24h atrás 0.5;
+3. descarta agregados mais antigos que a janela.
+
+A listagem só ordena pela coluna (índice userset_public_trending_idx); nada é
+agregado por requisição. Remoções não descontam: o score mede atividade ganha.
+"""
+
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import UserSet, UserSetActivity, UserSetFavorite, UserSetLike
+
+
+WINDOW = timedelta(days=7)
+HALF_LIFE = timedelta(hours=24)
+
+# Tabela de votos -> coluna em UserSetActivity
+ACTIVITY_SOURCES = {
+    'likes': UserSetLike,
+    'favorites': UserSetFavorite,
+}
+
+
+def floor_hour(moment):
+    """Início (UTC) da hora que contém `moment`"""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_activity(now=None, full=False):
+    """
+    Agrega em UserSetActivity as horas fechadas ainda não agregadas. A última
+    hora já agregada é refeita (votos de transações que fecharam atrasadas);
+    `full` refaz a janela inteira. Retorna quantas linhas foram gravadas.
+    """
+    until = floor_hour(now or timezone.now())
+    start = until - WINDOW
+    if not full:
+        last_hour = UserSetActivity.objects.filter(hour__gte=start).order_by('-hour').values_list('hour', flat=True).first()
+        if last_hour is not None:
+            start = last_hour
+
+    buckets = defaultdict(lambda: {'likes': 0, 'favorites': 0})
+    for column, model in ACTIVITY_SOURCES.items():
+        rows = (
+            model.objects.filter(created_at__gte=start, created_at__lt=until)
+            .annotate(bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .values_list('userset_id', 'bucket').annotate(total=Count('pk')).order_by()
+        )
+        for set_id, hour, total in rows:
+            buckets[set_id, hour][column] = total
+
+    with transaction.atomic():
+        UserSetActivity.objects.filter(hour__gte=start, hour__lt=until).delete()
+        UserSetActivity.objects.bulk_create(
+            [UserSetActivity(user_set_id=set_id, hour=hour, **counts) for (set_id, hour), counts in buckets.items()],
+            batch_size=1000,
+        )
+    return len(buckets)
+
+
+def decay(age):
+    """Peso de uma hora com idade `age` (timedelta)"""
+    return 0.5 ** (age / HALF_LIFE)
+
+
+def recompute_trending_scores(now=None):
+    """Recalcula trending_score a partir dos agregados da janela. Retorna quantos sets pontuaram."""
+    # Referência: fim da última hora fechada (a hora mais recente tem idade 0)
+    reference = floor_hour(now or timezone.now()) - timedelta(hours=1)
+    scores = defaultdict(float)
+    rows = UserSetActivity.objects.filter(hour__gt=reference - WINDOW).values_list(
+        'user_set_id', 'hour', 'likes', 'favorites',
+    )
+    for set_id, hour, likes, favorites in rows.iterator(chunk_size=5000):
+        scores[set_id] += (likes + favorites) * decay(reference - hour)
+
+    with transaction.atomic():
+        # Sets que saíram da janela voltam a zero; os demais recebem o novo score
+        UserSet.objects.filter(trending_score__gt=0).update(trending_score=0)
+        UserSet.objects.bulk_update(
+            [UserSet(pk=set_id, trending_score=round(score, 6)) for set_id, score in scores.items()],
+            ['trending_score'], batch_size=1000,
+        )
+    return len(scores)
+
+
+def prune_activity(now=None):
+    """Remove agregados fora da janela. Retorna quantas linhas saíram."""
+    cutoff = floor_hour(now or timezone.now()) - WINDOW
+    deleted, _ = UserSetActivity.objects.filter(hour__lt=cutoff).delete()
+    return deleted
@@ -3,12 +3,15 @@ from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from armory.models import Armor
 from armory.serializers import ArmorSerializer, ArmorListSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin
 
 
-class ArmorViewSet(viewsets.ModelViewSet):
+class ArmorViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     """ViewSet para Armaduras com filtros"""
     queryset = Armor.objects.select_related('passive').all()
     permission_classes = [AllowAny]
+    version_resource = 'armory'
+    fast_list = True
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     # Filtros disponíveis
@@ -3,13 +3,15 @@ from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from armory.models import Cape
 from armory.serializers import CapeSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin
 
 
-class CapeViewSet(viewsets.ModelViewSet):
+class CapeViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     """ViewSet para Capas"""
     queryset = Cape.objects.all()
     serializer_class = CapeSerializer
     permission_classes = [AllowAny]
+    version_resource = 'armory'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     filterset_fields = {
@@ -18,9 +18,10 @@ from armory.serializers import (
     ArmorSerializer,
     CapeSerializer
 )
+from common.mixins import SparseFieldsMixin
 
 
-class BaseComponentRelationViewSet(viewsets.ModelViewSet):
+class BaseComponentRelationViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     # Needs to be defined in subclasses
@@ -3,13 +3,15 @@ from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from armory.models import Helmet
 from armory.serializers import HelmetSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin
 
 
-class HelmetViewSet(viewsets.ModelViewSet):
+class HelmetViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     """ViewSet para Capacetes"""
     queryset = Helmet.objects.all()
     serializer_class = HelmetSerializer
     permission_classes = [AllowAny]
+    version_resource = 'armory'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     filterset_fields = {
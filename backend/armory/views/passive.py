@@ -2,10 +2,12 @@ from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from armory.models import Passive
 from armory.serializers import PassiveSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin
 
 
-class PassiveViewSet(viewsets.ModelViewSet):
+class PassiveViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     """ViewSet para Passivas"""
     queryset = Passive.objects.all()
     serializer_class = PassiveSerializer
     permission_classes = [AllowAny]
+    version_resource = 'armory'
@@ -3,9 +3,10 @@ from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from armory.models import ArmorSet
 from armory.serializers import ArmorSetSerializer, ArmorSetListSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin
 
 
-class ArmorSetViewSet(viewsets.ModelViewSet):
+class ArmorSetViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     """ViewSet para Sets completos"""
     queryset = ArmorSet.objects.select_related(
         'helmet', 
@@ -15,6 +16,7 @@ class ArmorSetViewSet(viewsets.ModelViewSet):
         'armor__pass_field'
     ).all()
     permission_classes = [AllowAny]
+    version_resource = 'armory'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     search_fields = ['name', 'helmet__name', 'armor__name', 'cape__name']
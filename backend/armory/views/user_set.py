@@ -1,11 +1,18 @@
+import secrets
+
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q, F
+from rest_framework.utils.urls import replace_query_param
+from armory.counters import toggle_vote
 from armory.models import UserSet
 from armory.serializers import UserSetSerializer
+from common.mixins import SparseFieldsMixin
+from common.pagination import KeysetPagination
+from common.prefetch import prefetch_plan
+from common.shuffle import SeededShufflePagination
 
-class UserSetViewSet(viewsets.ModelViewSet):
+class UserSetViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar sets criados por usuários.
     
@@ -13,13 +20,20 @@ class UserSetViewSet(viewsets.ModelViewSet):
     Retorna lista de sets.
     - Se ?mode=community: Retorna todos os sets públicos
     - Caso contrário: Retorna apenas os sets do usuário logado
+
+    Paginação por cursor na ordenação ativa (siga os links next/previous, sem
+    count). ?ordering=random&seed=<qualquer valor> embaralha de forma estável
+    entre as páginas; sem seed, uma é sorteada e repassada nos links.
     """
     serializer_class = UserSetSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetPagination
     search_fields = ['name', 'user__username']
-    ordering_fields = ['created_at', 'likes_count', 'favorites_count']
-    ordering = ['-created_at']
+    ordering_fields = ['created_at', 'likes_count', 'favorites_count', 'popularity']
+    # Sem `ordering` padrão: o OrderingFilter o aplicaria por cima de smart/random/trending
+    # (valores que ele não conhece). O padrão vem do get_queryset / Meta.ordering.
+    shuffle_seed = None
 
     def get_queryset(self):
         user = self.request.user
@@ -29,6 +43,12 @@ class UserSetViewSet(viewsets.ModelViewSet):
         
         # Base Queryset
         queryset = UserSet.objects.all()
+        if self.action in ('like', 'favorite'):
+            # Toggles só precisam confirmar que o set é visível
+            queryset = queryset.only('pk')
+        else:
+            # Joins/prefetches que o UserSetSerializer vai ler (armas, booster, estratagemas...)
+            queryset = prefetch_plan(self.get_serializer_class()).apply(queryset)
 
         # Filter by Type
         if set_type == 'loadout':
@@ -38,33 +58,40 @@ class UserSetViewSet(viewsets.ModelViewSet):
         
         if mode == 'community':
             # Comunidade: Apenas sets públicos
-            queryset = queryset.filter(is_public=True).annotate(
-                likes_count=Count('likes', distinct=True),
-                favorites_count=Count('favorites', distinct=True)
-            ).select_related('user', 'helmet', 'armor', 'cape')
+            queryset = queryset.filter(is_public=True)
 
             # Ordenação Customizada
             if ordering_param == 'random':
-                return queryset.order_by('?')
+                # Ordem da semente sobre a random_key, aplicada na paginação (common.shuffle)
+                self.shuffle_seed = self.request.query_params.get('seed') or secrets.token_hex(4)
+                return queryset.order_by('random_key', 'pk')
+            elif ordering_param == 'trending':
+                # Tendência: score com decaimento recalculado de hora em hora (recompute_trending)
+                return queryset.order_by('-trending_score', '-created_at')
             elif ordering_param == 'smart' or not ordering_param:
-                # Smart Sort: Combinação de Likes, Favoritos e Recência
-                return queryset.annotate(
-                    popularity=F('likes_count') + F('favorites_count')
-                ).order_by('-popularity', '-created_at')
+                # Smart Sort: Combinação de Likes e Favoritos (coluna popularity) e Recência
+                return queryset.order_by('-popularity', '-created_at')
             
             return queryset
         elif mode == 'favorites':
             # Meus Favoritos: Sets públicos que o usuário favoritou
-            return queryset.filter(is_public=True, favorites=user).annotate(
-                likes_count=Count('likes', distinct=True),
-                favorites_count=Count('favorites', distinct=True)
-            ).select_related('user', 'helmet', 'armor', 'cape')
+            return queryset.filter(is_public=True, favorites=user)
         else:
             # Meus Sets: Apenas sets do usuário (públicos ou privados)
-            return queryset.filter(user=user).annotate(
-                likes_count=Count('likes', distinct=True),
-                favorites_count=Count('favorites', distinct=True)
-            ).select_related('user', 'helmet', 'armor', 'cape')
+            return queryset.filter(user=user)
+
+    def paginate_queryset(self, queryset):
+        if self.shuffle_seed is not None:
+            self._paginator = SeededShufflePagination(self.shuffle_seed)
+        return super().paginate_queryset(queryset)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.shuffle_seed is not None:
+            for link in ('next', 'previous'):
+                if response.data.get(link):
+                    response.data[link] = replace_query_param(response.data[link], 'seed', self.shuffle_seed)
+        return response
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -83,35 +110,20 @@ class UserSetViewSet(viewsets.ModelViewSet):
     def like(self, request, pk=None):
         """Toggle like no set"""
         user_set = self.get_object()
-        user = request.user
-        
-        if user in user_set.likes.all():
-            user_set.likes.remove(user)
-            liked = False
-        else:
-            user_set.likes.add(user)
-            liked = True
-            
+        liked, total_likes = toggle_vote('likes', user_set.pk, request.user.pk)
         return Response({
             'status': 'success',
             'liked': liked,
-            'total_likes': user_set.likes.count()
+            'total_likes': total_likes
         })
 
     @action(detail=True, methods=['post'])
     def favorite(self, request, pk=None):
         """Toggle favorite no set"""
         user_set = self.get_object()
-        user = request.user
-        
-        if user in user_set.favorites.all():
-            user_set.favorites.remove(user)
-            favorited = False
-        else:
-            user_set.favorites.add(user)
-            favorited = True
-            
+        favorited, total_favorites = toggle_vote('favorites', user_set.pk, request.user.pk)
         return Response({
             'status': 'success',
-            'favorited': favorited
+            'favorited': favorited,
+            'total_favorites': total_favorites
         })
@@ -9,9 +9,10 @@ from armory.serializers.user_set_relation import (
     UserArmorSetRelationCreateSerializer
 )
 from armory.serializers.set import ArmorSetListSerializer
+from common.mixins import SparseFieldsMixin
 
 
-class UserArmorSetRelationViewSet(viewsets.ModelViewSet):
+class UserArmorSetRelationViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciar relações entre usuários e sets"""
     serializer_class = UserArmorSetRelationSerializer
     permission_classes = [IsAuthenticated]
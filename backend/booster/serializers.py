@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Booster, UserBoosterRelation
 from warbonds.serializers import WarbondSerializer
+from common.store import CatalogRelatedField
 
 class BoosterSerializer(serializers.ModelSerializer):
-    warbond_details = WarbondSerializer(source='warbond', read_only=True)
+    warbond_details = CatalogRelatedField(WarbondSerializer(), source='warbond')
 
     class Meta:
         model = Booster
@@ -3,15 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Booster, UserBoosterRelation
 from .serializers import BoosterSerializer, UserBoosterRelationSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin, SparseFieldsMixin
 
-class BoosterViewSet(viewsets.ModelViewSet):
+class BoosterViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     queryset = Booster.objects.all()
     serializer_class = BoosterSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    version_resource = 'boosters'
     search_fields = ['name', 'name_pt_br']
     ordering_fields = ['name', 'cost', 'created_at']
 
-class UserBoosterRelationViewSet(viewsets.ModelViewSet):
+class UserBoosterRelationViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing user relations with boosters (favorites, collection, wishlist)
     """
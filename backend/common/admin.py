@@ -1,7 +1,14 @@
 from django.contrib import admin
-from .models import GlobalVersion
+from .models import GlobalVersion, CatalogTombstone
 
 @admin.register(GlobalVersion)
 class GlobalVersionAdmin(admin.ModelAdmin):
     list_display = ('resource', 'updated_at')
     readonly_fields = ('updated_at',)
+
+
+@admin.register(CatalogTombstone)
+class CatalogTombstoneAdmin(admin.ModelAdmin):
+    list_display = ('model', 'object_id', 'deleted_at')
+    list_filter = ('model',)
+    readonly_fields = ('deleted_at',)
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CommonConfig(AppConfig):
@@ -7,3 +8,6 @@ class CommonConfig(AppConfig):
 
     def ready(self):
         import common.signals
+        if settings.REQUEST_METRICS_SERIALIZERS:
+            from common.metrics import instrument_serializers
+            instrument_serializers()
@@ -0,0 +1,205 @@
+"""
+Cache de respostas das ViewSets do catálogo
+
+Cada consulta (URL com query string normalizada + idioma) ocupa uma única
+entrada no cache, guardada junto com a versão do recurso que a gerou. Uma
+entrada só é servida como atual se for da versão corrente (ou mais nova), então
+um bump de GlobalVersion dispensa invalidação explícita.
+
+Reconstruções são coalescidas (single-flight): após um bump, apenas quem
+obtém a trava recalcula a entrada. Os demais recebem a versão anterior
+durante a janela de stale-while-revalidate ou aguardam brevemente o resultado.
+A trava usa cache.add, então o alcance depende do backend (CACHE_URL):
+
+- locmem:// -- por processo: cada worker do gunicorn reconstrói uma vez;
+- file:// -- as entradas são compartilhadas, mas o add() do FileBasedCache
+  não é atômico entre processos: dois workers podem reconstruir a mesma
+  entrada ao mesmo tempo (trabalho duplicado, resultado igual);
+- redis:// -- add() atômico (SET NX): um único worker reconstrói.
+
+Para clientes JSON, o corpo renderizado também é guardado já comprimido
+(brotli, se o pacote estiver instalado, ou gzip) e servido sem recompressão.
+"""
+
+import gzip
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from django.utils.translation import get_language
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .versioning import GLOBAL_RESOURCE, get_version
+
+try:
+    import brotli
+except ImportError:  # Opcional: sem o pacote, apenas gzip é pré-comprimido
+    brotli = None
+
+
+# Validade máxima da trava de reconstrução (caso o worker morra no meio)
+LOCK_TIMEOUT = 30
+
+# Quanto um worker sem entrada anterior espera pelo resultado de quem reconstrói
+SINGLE_FLIGHT_WAIT = 2.0
+SINGLE_FLIGHT_POLL = 0.05
+
+# Por quanto tempo após um bump a versão anterior ainda pode ser servida
+STALE_WHILE_REVALIDATE = timedelta(seconds=60)
+
+# Corpos pré-comprimidos uma vez por versão, então usamos o nível máximo
+COMPRESSORS = {
+    'gzip': lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda body: brotli.compress(body, quality=11)
+
+# Ordem de preferência quando o cliente aceita mais de uma codificação
+ENCODING_PREFERENCE = ('br', 'gzip')
+
+
+def get_or_build(key, version, build, timeout=DEFAULT_TIMEOUT):
+    """
+    Retorna (versão, valor) da entrada `key`, reconstruindo-a com `build()`
+    quando ela é anterior a `version`. A versão retornada pode ser anterior à
+    pedida quando outro worker está reconstruindo (stale-while-revalidate).
+    A trava só coalesce entre processos com redis:// (ver o docstring do módulo).
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[0] >= version:
+        return entry
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            entry = (version, build())
+            cache.set(key, entry, timeout)
+            return entry
+        finally:
+            cache.delete(lock_key)
+
+    # Outro worker já está reconstruindo esta entrada
+    if entry is not None and timezone.now() - version <= STALE_WHILE_REVALIDATE:
+        return entry
+
+    deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL)
+        entry = cache.get(key)
+        if entry is not None and entry[0] >= version:
+            return entry
+
+    # Quem reconstrói demorou demais: calcula localmente sem travar
+    return (version, build())
+
+
+def response_cache_key(request, resource):
+    """Chave do cache: recurso + origem/caminho + query ordenada + idioma"""
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    parts = (
+        # As URLs de imagem são absolutas, então a origem faz parte da chave
+        request.build_absolute_uri(request.path),
+        query,
+        get_language() or request.META.get('HTTP_ACCEPT_LANGUAGE', ''),
+    )
+    digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+    return f'catalog:response:{resource}:{digest}'
+
+
+class _Uncacheable(Exception):
+    """Resultado que deve ser devolvido sem ir para o cache (ex.: 404, versão anterior)"""
+
+    def __init__(self, version, response):
+        self.version = version
+        self.response = response
+
+
+def negotiate_encoding(request):
+    """Escolhe a codificação pré-comprimida aceita pelo cliente (ou None)"""
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in ENCODING_PREFERENCE:
+        if encoding in COMPRESSORS and accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def compressed_response(body, encoding, content_type):
+    response = HttpResponse(body, content_type=content_type)
+    response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(body))
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def cache_response(view_method):
+    """
+    Decorator para list/retrieve das ViewSets do catálogo.
+
+    Guarda o `response.data` já serializado, então a negociação de conteúdo
+    (JSON/API navegável) continua funcionando normalmente. Para clientes JSON
+    que aceitam br/gzip, guarda também o corpo já renderizado e comprimido, que
+    é servido direto (o GZipMiddleware ignora respostas com Content-Encoding).
+
+    Usa a versão já lida pelo ConditionalGetMixin e informa a ele, via
+    `catalog_version`, quando a resposta servida é de uma versão anterior.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        resource = getattr(self, 'version_resource', GLOBAL_RESOURCE)
+        version = getattr(self, 'catalog_version', None) or get_version(resource)
+        key = response_cache_key(request, resource)
+
+        def build_data():
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                raise _Uncacheable(version, response)
+            return response.data
+
+        renderer = request.accepted_renderer
+        encoding = negotiate_encoding(request) if isinstance(renderer, JSONRenderer) else None
+
+        try:
+            if encoding is None:
+                served_version, data = get_or_build(key, version, build_data)
+                response = Response(data)
+            else:
+                media_type = request.accepted_media_type
+                content_type = f'{media_type}; charset={renderer.charset}' if renderer.charset else media_type
+
+                def build_body():
+                    data_version, data = get_or_build(key, version, build_data)
+                    rendered = renderer.render(data, media_type, self.get_renderer_context())
+                    body = COMPRESSORS[encoding](rendered)
+                    if data_version < version:
+                        # Dados de outra versão: serve, mas não grava como atual
+                        raise _Uncacheable(data_version, compressed_response(body, encoding, content_type))
+                    return body
+
+                body_key = f'{key}:{hashlib.sha1(media_type.encode()).hexdigest()}:{encoding}'
+                served_version, body = get_or_build(body_key, version, build_body)
+                response = compressed_response(body, encoding, content_type)
+        except _Uncacheable as exc:
+            served_version, response = exc.version, exc.response
+
+        self.catalog_version = served_version
+        return response
+    return wrapper
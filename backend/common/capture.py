@@ -0,0 +1,213 @@
+"""
+Captura amostrada de requisições reais da API para replay local
+
+Ativada por REQUEST_CAPTURE_RATE (fração entre 0 e 1; 0 desliga). Cada
+requisição amostrada vira uma linha JSON compacta em REQUEST_CAPTURE_PATH:
+
+    {"t": 1718300000.1, "m": "GET", "r": "api/v1/armory/^community-sets/$", "k": {},
+     "q": "mode=community&ordering=smart", "u": "3f9a1c0b7d2e", "v": "community-sets-list",
+     "s": 200, "ms": 41.2, "n": 12}
+
+Nada do texto cru da URL é gravado: `r` é o padrão da rota resolvida, `k` os
+argumentos dela e `q` só os parâmetros de CAPTURE_QUERY_PARAMS e os
+filterset_fields da view (busca em texto livre fica de fora). Rotas de
+autenticação, senha e verificação de e-mail (tokens na URL ou na query) e
+URLs que não resolvem não são capturadas. `u` é um HMAC do id do usuário
+(nunca o id, e-mail ou token). Corpos de requisição não são gravados. O
+comando `replay_requests` reexecuta o arquivo contra o build local (com os
+clientes de common.loadtest), reconstruindo a URL pela view e pelos
+argumentos, e compara latência e queries por view.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from django.utils.crypto import salted_hmac
+from django.utils.http import urlencode
+
+from .loadtest import _QUERY_COUNT, StepStats
+from .metrics import API_PREFIX, current_metrics
+
+
+# Rotas com tokens ou dados pessoais na URL/query (reset de senha, login, checagem de e-mail)
+CAPTURE_EXCLUDED_PREFIXES = (
+    f'{API_PREFIX}auth/',
+    f'{API_PREFIX}password/',
+    f'{API_PREFIX}check/',
+    f'{API_PREFIX}verify-email/',
+    f'{API_PREFIX}resend-verification-email/',
+)
+
+# Parâmetros de consulta gravados (além dos filterset_fields da view)
+CAPTURE_QUERY_PARAMS = frozenset({
+    'mode', 'type', 'ordering', 'page', 'page_size', 'cursor', 'seed', 'fields', 'omit', 'format', 'since',
+})
+
+
+def captured_query(request, match):
+    """Query string só com os parâmetros permitidos para a view resolvida"""
+    view_class = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    allowed = CAPTURE_QUERY_PARAMS | set(getattr(view_class, 'filterset_fields', None) or ())
+    return urlencode(
+        [(name, values) for name, values in request.GET.lists() if name in allowed], doseq=True,
+    )
+
+
+def anonymize_user(user):
+    """Identificador estável e não reversível do usuário (None se anônimo)"""
+    if user is None or not user.is_authenticated:
+        return None
+    return salted_hmac('common.capture', str(user.pk)).hexdigest()[:12]
+
+
+def read_capture(path):
+    """Lê um arquivo de captura, ignorando linhas corrompidas (ex.: escrita interrompida)"""
+    with open(path) as capture:
+        for line in capture:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class RequestCaptureMiddleware:
+    """
+    Grava uma amostra das requisições de /api/v1/ (deve ficar depois do
+    RequestMetricsMiddleware, de onde vem a contagem de queries).
+    """
+
+    def __init__(self, get_response):
+        self.rate = getattr(settings, 'REQUEST_CAPTURE_RATE', 0)
+        if not self.rate:
+            raise MiddlewareNotUsed
+        self.path = settings.REQUEST_CAPTURE_PATH
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (not request.path.startswith(API_PREFIX) or request.path.startswith(CAPTURE_EXCLUDED_PREFIXES)
+                or random.random() >= self.rate):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        if match is None:
+            return response
+
+        metrics = current_metrics()
+        entry = {
+            't': round(time.time(), 3),
+            'm': request.method,
+            'r': match.route,
+            'k': {name: str(value) for name, value in match.kwargs.items()},
+            'q': captured_query(request, match),
+            # O DRF repassa o usuário autenticado (JWT) para o HttpRequest
+            'u': anonymize_user(getattr(request, 'user', None)),
+            'v': match.view_name,
+            's': response.status_code,
+            'ms': round(elapsed * 1000, 1),
+            'n': metrics.queries if metrics else None,
+        }
+        self.write(entry)
+        return response
+
+    def write(self, entry):
+        # Uma única write com O_APPEND: linhas curtas não se misturam entre workers
+        line = (json.dumps(entry, separators=(',', ':')) + '\n').encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+class CaptureReplay:
+    """
+    Reexecuta entradas capturadas e agrupa, por view, as medições originais e
+    as do replay. `tokens` mapeia cada identidade anonimizada para um token
+    local (entradas de identidades sem token vão sem autenticação).
+    """
+
+    def __init__(self, entries, client_factory, tokens=None, concurrency=1):
+        self.entries = list(entries)
+        self.client_factory = client_factory
+        self.tokens = tokens or {}
+        self.concurrency = max(1, concurrency)
+        self.captured = defaultdict(StepStats)
+        self.replayed = defaultdict(StepStats)
+        self.status_changes = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def run(self):
+        for entry in self.entries:
+            stats = self.captured[entry['v']]
+            stats.latencies.append(entry['ms'] / 1000)
+            if entry.get('n') is not None:
+                stats.queries.append(entry['n'])
+
+        # Distribuição round-robin preserva a ordem relativa dentro de cada thread
+        threads = [
+            threading.Thread(target=self.worker, args=(self.entries[index::self.concurrency],), daemon=True)
+            for index in range(self.concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        views = {}
+        for view, captured in sorted(self.captured.items()):
+            before = captured.summary(elapsed)
+            after = self.replayed[view].summary(elapsed)
+            views[view] = {
+                'requests': before['requests'],
+                'status_changes': self.status_changes[view],
+                'errors': after['errors'],
+                'captured': {key: before[key] for key in ('p50_ms', 'p95_ms', 'avg_queries')},
+                'replayed': {key: after[key] for key in ('p50_ms', 'p95_ms', 'avg_queries')},
+            }
+        return {'requests': len(self.entries), 'elapsed_s': round(elapsed, 2), 'views': views}
+
+    def worker(self, entries):
+        clients = {}
+        try:
+            for entry in entries:
+                token = self.tokens.get(entry.get('u'))
+                if token not in clients:
+                    clients[token] = self.client_factory(token)
+                self.execute(clients[token], entry)
+        finally:
+            for client in clients.values():
+                client.close()
+
+    def execute(self, client, entry):
+        path = reverse(entry['v'], kwargs=entry.get('k'))
+        if entry.get('q'):
+            path = f"{path}?{entry['q']}"
+        start = time.perf_counter()
+        status_code, server_timing, _ = client.request(entry['m'].lower(), path)
+        latency = time.perf_counter() - start
+
+        view = entry['v']
+        match = _QUERY_COUNT.search(server_timing)
+        with self.lock:
+            stats = self.replayed[view]
+            stats.latencies.append(latency)
+            if match:
+                stats.queries.append(int(match.group(1)))
+            if status_code >= 400:
+                stats.errors += 1
+            if status_code != entry.get('s'):
+                self.status_changes[view] += 1
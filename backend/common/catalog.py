@@ -0,0 +1,159 @@
+"""
+Catálogo público consolidado (snapshot único de todos os itens do jogo)
+
+O snapshot é construído uma única vez por valor de GlobalVersion e servido
+do cache até o próximo bump feito por common.signals.global_update_handler.
+A sincronização incremental devolve apenas o que mudou desde uma versão.
+"""
+
+import hashlib
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from armory.models import Armor, Helmet, Cape, ArmorSet, Passive
+from armory.serializers import (
+    ArmorListSerializer,
+    HelmetSerializer,
+    CapeSerializer,
+    ArmorSetListSerializer,
+    PassiveSerializer,
+)
+from weaponry.models import PrimaryWeapon, SecondaryWeapon, Throwable
+from weaponry.serializers import PrimaryWeaponSerializer, SecondaryWeaponSerializer, ThrowableSerializer
+from stratagems.models import Stratagem
+from stratagems.serializers import StratagemSerializer
+from booster.models import Booster
+from booster.serializers import BoosterSerializer
+from warbonds.models import Warbond, AcquisitionSource
+from warbonds.serializers import WarbondListSerializer, AcquisitionSourceSerializer
+
+from .cache import get_or_build
+from .models import CatalogTombstone
+from .versioning import get_version
+
+
+# Tempo máximo de vida no cache (a chave já muda a cada bump de versão)
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Margem aplicada ao `since` da sincronização: o updated_at de uma linha é
+# gravado antes do commit (e do bump), então uma transação concorrente pode
+# publicar linhas com timestamp anterior à versão que o cliente já conhece.
+CHANGES_OVERLAP = timedelta(minutes=1)
+
+
+class CatalogSection:
+    """Seção do catálogo: queryset, serializer da listagem e timestamps embutidos"""
+
+    def __init__(self, key, queryset, serializer_class, nested_timestamps=()):
+        self.key = key
+        self.queryset = queryset
+        self.serializer_class = serializer_class
+        # Lookups de updated_at dos objetos aninhados pelo serializer
+        # (ex.: pass_detail), para que a linha conte como alterada junto com eles
+        self.nested_timestamps = nested_timestamps
+
+    @property
+    def model(self):
+        return self.queryset.model
+
+    def changed_since(self, since):
+        lookups = ('updated_at',) + tuple(self.nested_timestamps)
+        condition = reduce(or_, (Q(**{f'{lookup}__gt': since}) for lookup in lookups))
+        return self.queryset.filter(condition)
+
+
+_WARBOND_AND_SOURCE = ('pass_field__updated_at', 'acquisition_source__updated_at')
+
+CATALOG_SECTIONS = (
+    CatalogSection('armors', Armor.objects.select_related('passive'), ArmorListSerializer,
+                   ('passive__updated_at',)),
+    CatalogSection('helmets', Helmet.objects.select_related('pass_field', 'acquisition_source'), HelmetSerializer,
+                   _WARBOND_AND_SOURCE),
+    CatalogSection('capes', Cape.objects.select_related('pass_field', 'acquisition_source'), CapeSerializer,
+                   _WARBOND_AND_SOURCE),
+    CatalogSection('passives', Passive.objects.all(), PassiveSerializer),
+    CatalogSection('sets', ArmorSet.objects.select_related(
+        'helmet__pass_field', 'helmet__acquisition_source',
+        'armor__passive', 'armor__pass_field', 'armor__acquisition_source',
+        'cape__pass_field', 'cape__acquisition_source',
+    ), ArmorSetListSerializer, (
+        'helmet__updated_at', 'armor__updated_at', 'cape__updated_at', 'armor__passive__updated_at',
+    ) + tuple(
+        f'{component}__{lookup}' for component in ('helmet', 'armor', 'cape') for lookup in _WARBOND_AND_SOURCE
+    )),
+    CatalogSection('primary_weapons', PrimaryWeapon.objects.select_related('acquisition_source'),
+                   PrimaryWeaponSerializer, ('acquisition_source__updated_at',)),
+    CatalogSection('secondary_weapons', SecondaryWeapon.objects.select_related('acquisition_source'),
+                   SecondaryWeaponSerializer, ('acquisition_source__updated_at',)),
+    CatalogSection('throwables', Throwable.objects.select_related('acquisition_source'),
+                   ThrowableSerializer, ('acquisition_source__updated_at',)),
+    CatalogSection('stratagems', Stratagem.objects.select_related('warbond'), StratagemSerializer,
+                   ('warbond__updated_at',)),
+    CatalogSection('boosters', Booster.objects.select_related('warbond'), BoosterSerializer,
+                   ('warbond__updated_at',)),
+    CatalogSection('warbonds', Warbond.objects.all(), WarbondListSerializer),
+    CatalogSection('acquisition_sources', AcquisitionSource.objects.all(), AcquisitionSourceSerializer),
+)
+
+
+def build_catalog_snapshot(request, version):
+    """Serializa todas as seções do catálogo em um único documento"""
+    context = {'request': request}
+    snapshot = {'version': version.isoformat()}
+    for section in CATALOG_SECTIONS:
+        snapshot[section.key] = section.serializer_class(
+            section.queryset.all(), many=True, context=context
+        ).data
+    return snapshot
+
+
+def get_catalog_snapshot(request):
+    """
+    Retorna o snapshot da versão atual, construindo-o apenas em cache miss.
+
+    A chave inclui a origem da requisição porque as URLs de imagem são absolutas.
+    A reconstrução após um bump é feita por um único worker (ver common.cache).
+    """
+    version = get_version()
+    origin = request.build_absolute_uri('/')
+    cache_key = f'catalog:snapshot:{hashlib.sha1(origin.encode()).hexdigest()}'
+
+    _, snapshot = get_or_build(
+        cache_key, version, lambda: build_catalog_snapshot(request, version), SNAPSHOT_CACHE_TIMEOUT
+    )
+    return snapshot
+
+
+def get_catalog_changes(request, since):
+    """
+    Retorna as linhas criadas/alteradas e os IDs excluídos desde `since`.
+
+    A resposta traz a versão atual, que o cliente usa como próximo `since`.
+    Linhas repetidas entre sincronizações são esperadas (upsert no cliente).
+    """
+    version = get_version()
+    since = since - CHANGES_OVERLAP
+    context = {'request': request}
+
+    changes = {}
+    for section in CATALOG_SECTIONS:
+        rows = section.serializer_class(section.changed_since(since), many=True, context=context).data
+        if rows:
+            changes[section.key] = rows
+
+    sections_by_model = {section.model._meta.label_lower: section.key for section in CATALOG_SECTIONS}
+    deleted = {}
+    tombstones = CatalogTombstone.objects.filter(deleted_at__gt=since).values_list('model', 'object_id')
+    for model_label, object_id in tombstones:
+        key = sections_by_model.get(model_label)
+        if key:
+            deleted.setdefault(key, []).append(object_id)
+
+    return {
+        'version': version.isoformat(),
+        'changes': changes,
+        'deleted': deleted,
+    }
@@ -0,0 +1,271 @@
+"""
+Serialização rápida de leitura a partir de tuplas do `.values_list()`
+
+Compila, uma vez por classe, a lista de campos de um ModelSerializer do DRF
+em um plano de colunas + conversores. Cada linha vira um dict sem instanciar
+modelos nem campos do DRF: displays de choices saem de um mapa valor -> rótulo
+e os detalhes aninhados (CatalogRelatedField) de um mapa id -> representação
+montado uma vez por resposta a partir do store de catálogo.
+
+A saída é idêntica à do serializer espelhado (ver FastSerializerParityTests);
+campos que o plano não sabe reproduzir (SerializerMethodField, métodos do
+modelo, M2M...) fazem a compilação falhar em vez de divergir em silêncio.
+"""
+
+from functools import cache
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.utils.encoding import force_str
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from .store import CatalogRelatedField, get_catalog_store
+
+
+_OMIT = object()
+
+# Campos do DRF cuja to_representation devolve o próprio valor vindo do banco
+_IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.ChoiceField)
+
+
+def _identity(value):
+    return value
+
+
+class _Column:
+    """Campo de saída lido de uma coluna: converter(valor) quando não nulo"""
+    __slots__ = ('name', 'index', 'convert')
+
+    def __init__(self, name, index, convert):
+        self.name = name
+        self.index = index
+        self.convert = convert
+
+    def bind(self, context):
+        return self
+
+    def __call__(self, row):
+        value = row[self.index]
+        return None if value is None else self.convert(value)
+
+
+class _Display:
+    """get_<campo>_display: rótulo traduzido no idioma ativo, resolvido uma vez por resposta"""
+    __slots__ = ('name', 'index', 'choices', 'labels')
+
+    def __init__(self, name, index, choices):
+        self.name = name
+        self.index = index
+        self.choices = choices
+        self.labels = None
+
+    def bind(self, context):
+        bound = _Display(self.name, self.index, self.choices)
+        bound.labels = {value: force_str(label, strings_only=True) for value, label in self.choices.items()}
+        return bound
+
+    def __call__(self, row):
+        value = row[self.index]
+        label = self.labels[value] if value in self.labels else force_str(value, strings_only=True)
+        return None if label is None else str(label)
+
+
+class _Through:
+    """Origem 'fk.campo': como no DRF, FK nula omite a chave (campo somente leitura)"""
+    __slots__ = ('name', 'fk_index', 'index', 'convert', 'missing')
+
+    def __init__(self, name, fk_index, index, convert, missing):
+        self.name = name
+        self.fk_index = fk_index
+        self.index = index
+        self.convert = convert
+        self.missing = missing
+
+    def bind(self, context):
+        return self
+
+    def __call__(self, row):
+        if row[self.fk_index] is None:
+            return self.missing
+        value = row[self.index]
+        return None if value is None else self.convert(value)
+
+
+class _File:
+    """ImageField/FileField: URL do storage, absoluta quando há request no contexto"""
+    __slots__ = ('name', 'index', 'storage', 'use_url', 'request')
+
+    def __init__(self, name, index, storage, use_url):
+        self.name = name
+        self.index = index
+        self.storage = storage
+        self.use_url = use_url
+        self.request = None
+
+    def bind(self, context):
+        bound = _File(self.name, self.index, self.storage, self.use_url)
+        bound.request = context.get('request')
+        return bound
+
+    def __call__(self, row):
+        name = row[self.index]
+        if not name:
+            return None
+        if not self.use_url:
+            return name
+        url = self.storage.url(name)
+        return self.request.build_absolute_uri(url) if self.request is not None else url
+
+
+class _Related:
+    """CatalogRelatedField: representação do registro relacionado, memorizada por id"""
+    __slots__ = ('name', 'index', 'model', 'serializer_class', 'serializer', 'store', 'memo')
+
+    def __init__(self, name, index, model, serializer_class):
+        self.name = name
+        self.index = index
+        self.model = model
+        self.serializer_class = serializer_class
+
+    def bind(self, context):
+        bound = _Related(self.name, self.index, self.model, self.serializer_class)
+        bound.serializer = self.serializer_class(context=context)
+        bound.store = context.get('catalog_store') or get_catalog_store()
+        bound.memo = {}
+        return bound
+
+    def __call__(self, row):
+        related_id = row[self.index]
+        if related_id is None:
+            return None
+        try:
+            return self.memo[related_id]
+        except KeyError:
+            record = self.store.get(self.model, related_id) or self.model._base_manager.get(pk=related_id)
+            representation = self.memo[related_id] = self.serializer.to_representation(record)
+            return representation
+
+
+def _converter(field):
+    if isinstance(field, serializers.BooleanField):
+        return bool
+    if isinstance(field, _IDENTITY_FIELDS):
+        return _identity
+    return field.to_representation
+
+
+def _missing(field):
+    """O que o DRF produz quando a origem pontuada passa por uma FK nula"""
+    if field.default is not empty:
+        return field.get_default()
+    if field.allow_null:
+        return None
+    return _OMIT
+
+
+class FastSerializerPlan:
+    """Colunas a buscar e conversores por campo de saída, na ordem do serializer"""
+
+    def __init__(self, serializer_class, only=None):
+        meta = serializer_class.Meta
+        self.serializer_class = serializer_class
+        self.model = meta.model
+        self.columns = []
+        self.fields = []
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (only is not None and name not in only):
+                continue
+            self.fields.append(self.compile_field(name, field))
+
+    def column(self, lookup):
+        if lookup not in self.columns:
+            self.columns.append(lookup)
+        return self.columns.index(lookup)
+
+    def unsupported(self, name, reason):
+        return ImproperlyConfigured(
+            f'{self.serializer_class.__name__}.{name}: {reason} não tem equivalente na serialização rápida'
+        )
+
+    def compile_field(self, name, field):
+        opts = self.model._meta
+        source = field.source
+
+        if isinstance(field, CatalogRelatedField):
+            model_field = opts.get_field(source)
+            return _Related(name, self.column(model_field.attname), model_field.related_model, type(field.child))
+
+        if isinstance(field, PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                raise self.unsupported(name, 'pk_field')
+            return _Column(name, self.column(opts.get_field(source).attname), _identity)
+
+        if source.startswith('get_') and source.endswith('_display'):
+            model_field = opts.get_field(source[len('get_'):-len('_display')])
+            return _Display(name, self.column(model_field.attname), dict(model_field.flatchoices))
+
+        if source == '*' or isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+            raise self.unsupported(name, type(field).__name__)
+
+        if '.' in source:
+            fk_name, _, related_name = source.partition('.')
+            fk = opts.get_field(fk_name)
+            if not fk.many_to_one or '.' in related_name:
+                raise self.unsupported(name, f"origem '{source}'")
+            fk.related_model._meta.get_field(related_name)
+            return _Through(
+                name, self.column(fk.attname), self.column(f'{fk_name}__{related_name}'),
+                _converter(field), _missing(field),
+            )
+
+        try:
+            model_field = opts.get_field(source)
+        except FieldDoesNotExist:
+            raise self.unsupported(name, f"origem '{source}'")
+        if not model_field.concrete or model_field.many_to_many:
+            raise self.unsupported(name, type(model_field).__name__)
+
+        if isinstance(model_field, models.FileField):
+            use_url = getattr(field, 'use_url', True)
+            return _File(name, self.column(model_field.attname), model_field.storage, use_url)
+        return _Column(name, self.column(model_field.attname), _converter(field))
+
+
+@cache
+def compile_serializer(serializer_class, only=None):
+    """Plano compilado (e reutilizado) para o ModelSerializer, opcionalmente só com os campos `only`"""
+    return FastSerializerPlan(serializer_class, only)
+
+
+class FastSerializer:
+    """
+    Equivalente somente leitura de `serializer_class(rows, many=True).data`
+    para linhas de `FastSerializer.values(queryset)`. `only` (tupla de nomes)
+    restringe os campos de saída e, com eles, as colunas buscadas.
+    """
+
+    def __init__(self, serializer_class, rows, context=None, only=None):
+        self.plan = compile_serializer(serializer_class, only)
+        self.rows = rows
+        self.context = context or {}
+
+    @classmethod
+    def values(cls, serializer_class, queryset, only=None):
+        """Queryset de tuplas com as colunas do plano (sem JOINs além das origens 'fk.campo')"""
+        return queryset.values_list(*compile_serializer(serializer_class, only).columns)
+
+    @property
+    def data(self):
+        fields = [field.bind(self.context) for field in self.plan.fields]
+        result = []
+        for row in self.rows:
+            item = {}
+            for field in fields:
+                value = field(row)
+                if value is not _OMIT:
+                    item[field.name] = value
+            result.append(item)
+        return result
@@ -0,0 +1,257 @@
+"""
+Harness de carga da API (usado pelo comando `manage.py loadtest`)
+
+Um cenário é um arquivo JSON com uma sequência de passos que cada
+usuário virtual executa em loop:
+
+    {
+      "name": "community-browse",
+      "auth": true,
+      "steps": [
+        {"name": "community-smart", "get": "/api/v1/armory/community-sets/?mode=community&ordering=smart",
+         "extract": {"set_id": "results.*.id"}},
+        {"name": "like", "post": "/api/v1/armory/community-sets/{set_id}/like/", "repeat": 3},
+        {"name": "detail", "get": "/api/v1/armory/community-sets/{set_id}/", "repeat": 5}
+      ]
+    }
+
+`extract` guarda valores da resposta JSON (caminho com '.' e '*' para listas) e
+`{variavel}` no caminho usa um deles ao acaso. As requisições passam pela
+URLconf real em processo (django.test.Client, uma thread por usuário virtual)
+ou por HTTP contra um servidor local (--base-url). As queries por requisição
+vêm do header Server-Timing do RequestMetricsMiddleware.
+"""
+
+import json
+import random
+import re
+import string
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+
+SCENARIOS_DIR = Path(__file__).resolve().parent / 'scenarios'
+
+METHODS = ('get', 'post', 'put', 'patch', 'delete')
+
+_QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+# ============================================================================
+# CENÁRIOS
+# ============================================================================
+
+@dataclass
+class Step:
+    name: str
+    method: str
+    path: str
+    data: dict = None
+    repeat: int = 1
+    extract: dict = field(default_factory=dict)
+
+    @property
+    def variables(self):
+        return [name for _, name, _, _ in string.Formatter().parse(self.path) if name]
+
+
+@dataclass
+class Scenario:
+    name: str
+    steps: list
+    auth: bool = False
+
+
+def load_scenario(reference):
+    """Carrega um cenário por caminho ou pelo nome de um dos cenários embutidos"""
+    path = Path(reference)
+    if not path.exists():
+        path = SCENARIOS_DIR / f'{reference}.json'
+    if not path.exists():
+        raise FileNotFoundError(f'Cenário não encontrado: {reference}')
+
+    raw = json.loads(path.read_text())
+
+    steps = []
+    for item in raw['steps']:
+        method = next((method for method in METHODS if method in item), None)
+        if method is None:
+            raise ValueError(f'Passo sem método HTTP em {path.name}: {item}')
+        steps.append(Step(
+            name=item.get('name') or f'{method.upper()} {item[method]}',
+            method=method,
+            path=item[method],
+            data=item.get('data'),
+            repeat=item.get('repeat', 1),
+            extract=item.get('extract', {}),
+        ))
+    return Scenario(name=raw.get('name', path.stem), steps=steps, auth=raw.get('auth', False))
+
+
+def extract_values(data, path):
+    """Percorre o JSON por 'a.b.*.c' e retorna a lista de valores encontrados"""
+    nodes = [data]
+    for part in path.split('.'):
+        next_nodes = []
+        for node in nodes:
+            if part == '*' and isinstance(node, list):
+                next_nodes.extend(node)
+            elif isinstance(node, dict) and part in node:
+                next_nodes.append(node[part])
+        nodes = next_nodes
+    return [node for node in nodes if node is not None]
+
+
+# ============================================================================
+# CLIENTES
+# ============================================================================
+
+class InProcessClient:
+    """Executa as requisições pela URLconf real, sem servidor HTTP"""
+
+    def __init__(self, token=None):
+        from django.test import Client
+        # Fora do test runner 'testserver' não está em ALLOWED_HOSTS
+        host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+        self.client = Client(SERVER_NAME=host)
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        self.secure = getattr(settings, 'SECURE_SSL_REDIRECT', False)
+
+    def request(self, method, path, data=None):
+        kwargs = dict(self.headers, secure=self.secure)
+        if data is not None:
+            kwargs.update(data=json.dumps(data), content_type='application/json')
+        response = getattr(self.client, method)(path, **kwargs)
+        return response.status_code, response.get('Server-Timing', ''), response.content
+
+    def close(self):
+        # Cada thread abre suas próprias conexões com o banco
+        connections.close_all()
+
+
+class HttpClient:
+    """Executa as requisições contra um servidor já rodando (ex.: gunicorn local)"""
+
+    def __init__(self, base_url, token=None):
+        import httpx
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        self.client = httpx.Client(base_url=base_url, headers=headers, timeout=60)
+
+    def request(self, method, path, data=None):
+        response = self.client.request(method.upper(), path, json=data)
+        return response.status_code, response.headers.get('server-timing', ''), response.content
+
+    def close(self):
+        self.client.close()
+
+
+# ============================================================================
+# EXECUÇÃO E ESTATÍSTICAS
+# ============================================================================
+
+def percentile(sorted_values, fraction):
+    """Percentil por posição mais próxima (lista já ordenada)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StepStats:
+    __slots__ = ('latencies', 'queries', 'errors', 'skipped')
+
+    def __init__(self):
+        self.latencies = []
+        self.queries = []
+        self.errors = 0
+        self.skipped = 0
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'skipped': self.skipped,
+            'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'avg_queries': round(sum(self.queries) / len(self.queries), 1) if self.queries else None,
+        }
+
+
+class LoadTest:
+    """Roda `concurrency` usuários virtuais, cada um repetindo o cenário `iterations` vezes"""
+
+    def __init__(self, scenario, concurrency, iterations, client_factory, tokens=(), seed=None):
+        self.scenario = scenario
+        self.concurrency = concurrency
+        self.iterations = iterations
+        self.client_factory = client_factory
+        self.tokens = list(tokens)
+        self.seed = seed
+        self.stats = {step.name: StepStats() for step in scenario.steps}
+        self.lock = threading.Lock()
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self.virtual_user, args=(index,), daemon=True)
+            for index in range(self.concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return {
+            'scenario': self.scenario.name,
+            'concurrency': self.concurrency,
+            'iterations': self.iterations,
+            'elapsed_s': round(elapsed, 2),
+            'endpoints': {name: stats.summary(elapsed) for name, stats in self.stats.items()},
+        }
+
+    def virtual_user(self, index):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        token = self.tokens[index % len(self.tokens)] if self.scenario.auth and self.tokens else None
+        client = self.client_factory(token)
+        variables = {}
+        try:
+            for _ in range(self.iterations):
+                for step in self.scenario.steps:
+                    for _ in range(step.repeat):
+                        self.execute(client, step, variables, rng)
+        finally:
+            client.close()
+
+    def execute(self, client, step, variables, rng):
+        stats = self.stats[step.name]
+        if any(not variables.get(name) for name in step.variables):
+            with self.lock:
+                stats.skipped += 1
+            return
+
+        path = step.path.format(**{name: rng.choice(variables[name]) for name in step.variables})
+        start = time.perf_counter()
+        status_code, server_timing, content = client.request(step.method, path, step.data)
+        latency = time.perf_counter() - start
+
+        if step.extract and status_code == 200:
+            payload = json.loads(content or b'null')
+            for name, json_path in step.extract.items():
+                variables[name] = extract_values(payload, json_path)
+
+        match = _QUERY_COUNT.search(server_timing)
+        with self.lock:
+            stats.latencies.append(latency)
+            if match:
+                stats.queries.append(int(match.group(1)))
+            if status_code >= 400:
+                stats.errors += 1
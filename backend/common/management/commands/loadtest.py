@@ -0,0 +1,93 @@
+"""
+Teste de carga da API a partir de cenários
+
+Uso:
+    python manage.py loadtest community_browse --concurrency 20 --iterations 10
+    python manage.py loadtest catalog_browse --base-url http://localhost:8000
+    python manage.py loadtest ./meu_cenario.json --json-output resultado.json
+
+Sem --base-url, as requisições passam pela URLconf em processo (uma thread por
+usuário virtual). Com --base-url, vão por HTTP para um servidor local, o que
+permite comparar configurações de workers do gunicorn. Cenários com "auth"
+usam tokens JWT de usuários gerados pelo seed_scale (--user-prefix).
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.loadtest import HttpClient, InProcessClient, LoadTest, load_scenario
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Executa cenários de carga e reporta p50/p95/p99, throughput e queries por endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='+',
+                            help='Arquivos de cenário (.json) ou nomes embutidos (ex.: community_browse)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Usuários virtuais simultâneos (padrão: 10)')
+        parser.add_argument('--iterations', type=int, default=5,
+                            help='Repetições do cenário por usuário virtual (padrão: 5)')
+        parser.add_argument('--base-url', help='Servidor local a testar por HTTP (padrão: em processo)')
+        parser.add_argument('--user-prefix', default='scale_',
+                            help='Prefixo dos usuários usados nos cenários autenticados (padrão: scale_)')
+        parser.add_argument('--seed', type=int, default=None, help='Semente para as escolhas aleatórias')
+        parser.add_argument('--json-output', help='Grava o relatório completo em JSON neste arquivo')
+
+    def handle(self, *args, **options):
+        try:
+            scenarios = [load_scenario(reference) for reference in options['scenarios']]
+        except (FileNotFoundError, ValueError, KeyError) as exc:
+            raise CommandError(str(exc))
+
+        tokens = []
+        if any(scenario.auth for scenario in scenarios):
+            users = User.objects.filter(username__startswith=options['user_prefix']).order_by('pk')
+            tokens = [str(AccessToken.for_user(user)) for user in users[:options['concurrency']]]
+            if not tokens:
+                raise CommandError(
+                    f'Nenhum usuário "{options["user_prefix"]}*" para os cenários autenticados. '
+                    'Rode o seed_scale antes.'
+                )
+
+        base_url = options['base_url']
+        if base_url:
+            def client_factory(token):
+                return HttpClient(base_url, token)
+        else:
+            client_factory = InProcessClient
+
+        reports = []
+        for scenario in scenarios:
+            self.stdout.write(
+                f'\n{scenario.name}: {options["concurrency"]} usuários x {options["iterations"]} iterações'
+                f' ({base_url or "em processo"})'
+            )
+            report = LoadTest(
+                scenario, options['concurrency'], options['iterations'],
+                client_factory, tokens=tokens, seed=options['seed'],
+            ).run()
+            self.print_report(report)
+            reports.append(report)
+
+        if options['json_output']:
+            with open(options['json_output'], 'w') as output:
+                json.dump(reports, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'\nRelatório gravado em {options["json_output"]}'))
+
+    def print_report(self, report):
+        header = f'{"endpoint":<32} {"reqs":>6} {"err":>4} {"rps":>8} {"p50":>9} {"p95":>9} {"p99":>9} {"queries":>8}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in report['endpoints'].items():
+            queries = '-' if row['avg_queries'] is None else f'{row["avg_queries"]:.1f}'
+            line = (
+                f'{name[:32]:<32} {row["requests"]:>6} {row["errors"]:>4} {row["throughput_rps"]:>8.1f}'
+                f' {row["p50_ms"]:>7.1f}ms {row["p95_ms"]:>7.1f}ms {row["p99_ms"]:>7.1f}ms {queries:>8}'
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+        self.stdout.write(f'Tempo total: {report["elapsed_s"]}s')
@@ -0,0 +1,121 @@
+"""
+Replay de requisições capturadas em produção (common.capture)
+
+Uso:
+    python manage.py replay_requests captures/requests.jsonl
+    python manage.py replay_requests requests.jsonl --base-url http://localhost:8000 --concurrency 4
+    python manage.py replay_requests requests.jsonl --view community-sets-list --json-output diff.json
+
+Cada identidade anonimizada da captura é associada, de forma determinística,
+a um usuário local gerado pelo seed_scale (--user-prefix), preservando quais
+requisições vinham do mesmo usuário. O relatório compara, por view, p50/p95 e
+média de queries da captura com os do replay.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.capture import CaptureReplay, read_capture
+from common.loadtest import HttpClient, InProcessClient
+
+User = get_user_model()
+
+
+def _delta(before, after):
+    if not before or after is None:
+        return '-'
+    return f'{(after - before) / before * 100:+.0f}%'
+
+
+class Command(BaseCommand):
+    help = 'Reexecuta uma captura de requisições e compara latência e queries por view'
+
+    def add_arguments(self, parser):
+        parser.add_argument('capture', help='Arquivo JSON Lines gravado pelo RequestCaptureMiddleware')
+        parser.add_argument('--base-url', help='Servidor local a testar por HTTP (padrão: em processo)')
+        parser.add_argument('--concurrency', type=int, default=1, help='Threads de replay (padrão: 1)')
+        parser.add_argument('--limit', type=int, help='Reexecuta apenas as primeiras N requisições')
+        parser.add_argument('--view', action='append', dest='views',
+                            help='Restringe o replay a esta view (pode repetir)')
+        parser.add_argument('--include-writes', action='store_true',
+                            help='Inclui POST/PUT/PATCH/DELETE (sem corpo; alteram o banco local)')
+        parser.add_argument('--user-prefix', default='scale_',
+                            help='Prefixo dos usuários locais para requisições autenticadas (padrão: scale_)')
+        parser.add_argument('--json-output', help='Grava o relatório completo em JSON neste arquivo')
+
+    def handle(self, *args, **options):
+        try:
+            entries = list(read_capture(options['capture']))
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if not options['include_writes']:
+            entries = [entry for entry in entries if entry['m'] in ('GET', 'HEAD', 'OPTIONS')]
+        if options['views']:
+            entries = [entry for entry in entries if entry.get('v') in options['views']]
+        if options['limit']:
+            entries = entries[:options['limit']]
+        if not entries:
+            raise CommandError('Nenhuma requisição para reexecutar.')
+
+        base_url = options['base_url']
+        if base_url:
+            def client_factory(token):
+                return HttpClient(base_url, token)
+        else:
+            client_factory = InProcessClient
+
+        report = CaptureReplay(
+            entries, client_factory,
+            tokens=self.tokens_for(entries, options['user_prefix']),
+            concurrency=options['concurrency'],
+        ).run()
+
+        self.stdout.write(f'\n{report["requests"]} requisições reexecutadas ({base_url or "em processo"})')
+        self.print_report(report)
+
+        if options['json_output']:
+            with open(options['json_output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'\nRelatório gravado em {options["json_output"]}'))
+
+    def tokens_for(self, entries, prefix):
+        identities = sorted({entry['u'] for entry in entries if entry.get('u')})
+        if not identities:
+            return {}
+        users = list(User.objects.filter(username__startswith=prefix).order_by('pk')[:len(identities)])
+        if not users:
+            raise CommandError(
+                f'A captura tem requisições autenticadas e não há usuários "{prefix}*". Rode o seed_scale antes.'
+            )
+        return {
+            identity: str(AccessToken.for_user(users[index % len(users)]))
+            for index, identity in enumerate(identities)
+        }
+
+    def print_report(self, report):
+        header = (
+            f'{"view":<32} {"reqs":>6} {"status≠":>7} {"p50 cap":>9} {"p50 rep":>9} {"Δp50":>6}'
+            f' {"p95 cap":>9} {"p95 rep":>9} {"q cap":>6} {"q rep":>6}'
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for view, row in report['views'].items():
+            before, after = row['captured'], row['replayed']
+            queries_before = '-' if before['avg_queries'] is None else f'{before["avg_queries"]:.1f}'
+            queries_after = '-' if after['avg_queries'] is None else f'{after["avg_queries"]:.1f}'
+            line = (
+                f'{view[:32]:<32} {row["requests"]:>6} {row["status_changes"]:>7}'
+                f' {before["p50_ms"]:>7.1f}ms {after["p50_ms"]:>7.1f}ms {_delta(before["p50_ms"], after["p50_ms"]):>6}'
+                f' {before["p95_ms"]:>7.1f}ms {after["p95_ms"]:>7.1f}ms {queries_before:>6} {queries_after:>6}'
+            )
+            # Mais queries que em produção é regressão, independente do ruído de latência
+            regressed = (
+                before['avg_queries'] is not None and after['avg_queries'] is not None
+                and after['avg_queries'] > before['avg_queries']
+            )
+            self.stdout.write(self.style.ERROR(line) if regressed or row['status_changes'] else line)
+        self.stdout.write(f'Tempo total: {report["elapsed_s"]}s')
@@ -0,0 +1,259 @@
+"""
+Gera volumes realistas de dados de usuário para testes de escala
+
+Uso:
+    python manage.py seed_scale --users 100000 --sets 1000000 --seed 42
+    python manage.py seed_scale --users 1000 --sets 10000 --flush
+
+Usa o catálogo já carregado (armaduras, armas, estratagemas, boosters) e cria
+usuários, sets da comunidade com estratagemas, curtidas/favoritos e relações
+de favorito/coleção/wishlist. Tudo via bulk_create em blocos (sem sinais,
+então os contadores de curtidas/favoritos são gravados já calculados), com o
+mesmo --seed gerando sempre os mesmos dados.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from armory.models import (
+    Armor, Helmet, Cape, ArmorSet, UserSet,
+    UserHelmetRelation, UserArmorRelation, UserCapeRelation, UserArmorSetRelation,
+)
+from weaponry.models import (
+    PrimaryWeapon, SecondaryWeapon, Throwable,
+    UserPrimaryWeaponRelation, UserSecondaryWeaponRelation, UserThrowableRelation,
+)
+from stratagems.models import Stratagem, UserStratagemRelation
+from booster.models import Booster, UserBoosterRelation
+
+User = get_user_model()
+
+RELATION_TYPES = ('favorite', 'collection', 'wishlist')
+
+# (modelo de relação, campo do item, modelo do catálogo)
+RELATION_SPECS = (
+    (UserHelmetRelation, 'helmet', Helmet),
+    (UserArmorRelation, 'armor', Armor),
+    (UserCapeRelation, 'cape', Cape),
+    (UserArmorSetRelation, 'armor_set', ArmorSet),
+    (UserPrimaryWeaponRelation, 'item', PrimaryWeapon),
+    (UserSecondaryWeaponRelation, 'item', SecondaryWeapon),
+    (UserThrowableRelation, 'item', Throwable),
+    (UserStratagemRelation, 'stratagem', Stratagem),
+    (UserBoosterRelation, 'booster', Booster),
+)
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """Desliga auto_now/auto_now_add para gravar datas espalhadas no tempo"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    try:
+        for field in fields:
+            field.auto_now = field.auto_now_add = False
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Gera usuários, sets da comunidade, curtidas e relações em volume para testes de escala'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000, help='Usuários a criar (padrão: 100000)')
+        parser.add_argument('--sets', type=int, default=1_000_000, help='UserSets a criar (padrão: 1000000)')
+        parser.add_argument('--relations-per-user', type=int, default=10,
+                            help='Média de relações por usuário em cada tabela de relação (padrão: 10)')
+        parser.add_argument('--seed', type=int, default=42, help='Semente do gerador (padrão: 42)')
+        parser.add_argument('--chunk-size', type=int, default=5_000, help='Linhas por bulk_create (padrão: 5000)')
+        parser.add_argument('--days', type=int, default=365, help='Janela de datas de criação, em dias (padrão: 365)')
+        parser.add_argument('--prefix', default='scale', help='Prefixo dos usernames gerados (padrão: scale)')
+        parser.add_argument('--flush', action='store_true',
+                            help='Remove antes os usuários gerados com o mesmo prefixo (e tudo ligado a eles)')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.now = timezone.now()
+        self.window = timedelta(days=options['days'])
+        prefix = f"{options['prefix']}_"
+
+        self.catalog = {
+            model: list(model.objects.order_by('pk').values_list('pk', flat=True))
+            for model in (Helmet, Armor, Cape, ArmorSet, PrimaryWeapon, SecondaryWeapon,
+                          Throwable, Stratagem, Booster)
+        }
+        if not all(self.catalog[model] for model in (Helmet, Armor, Cape)):
+            raise CommandError('Catálogo vazio: carregue capacetes, armaduras e capas antes de gerar dados.')
+
+        if options['sets'] and not options['users']:
+            raise CommandError('--sets exige ao menos um usuário (--users).')
+
+        if User.objects.filter(username__startswith=prefix).exists():
+            if not options['flush']:
+                raise CommandError(f'Já existem usuários "{prefix}*". Use --flush para recriá-los.')
+            self.stdout.write(f'Removendo usuários "{prefix}*" existentes...')
+            self.flush(prefix)
+
+        with manual_timestamps(User, UserSet, *[spec[0] for spec in RELATION_SPECS]):
+            user_ids = self.create_users(options['users'], prefix)
+            self.create_user_sets(options['sets'], user_ids)
+            self.create_relations(user_ids, options['relations_per_user'])
+
+        self.stdout.write(self.style.SUCCESS('Dados de escala gerados.'))
+
+    # ------------------------------------------------------------------ utils
+
+    def random_datetime(self):
+        return self.now - self.window * self.rng.random()
+
+    def chunks(self, total):
+        for start in range(0, total, self.chunk_size):
+            yield range(start, min(start + self.chunk_size, total))
+
+    def popularity(self, cap):
+        """Quantidade com cauda longa (poucos itens muito populares)"""
+        return min(int(self.rng.paretovariate(1.16)) - 1, cap)
+
+    def flush(self, prefix):
+        """
+        Remove os dados gerados antes. Delete direto nas tabelas dependentes:
+        o delete() do ORM dispararia os sinais de sincronização por linha.
+        """
+        users = User.objects.filter(username__startswith=prefix)
+        user_sets = UserSet.objects.filter(user__in=users)
+        with transaction.atomic():
+            for model, _, _ in RELATION_SPECS:
+                model.objects.filter(user__in=users)._raw_delete(model.objects.db)
+            for field in ('stratagems', 'likes', 'favorites'):
+                through = getattr(UserSet, field).through
+                through.objects.filter(userset__in=user_sets)._raw_delete(through.objects.db)
+            for field in ('likes', 'favorites'):
+                through = getattr(UserSet, field).through
+                through.objects.filter(customuser__in=users)._raw_delete(through.objects.db)
+            user_sets._raw_delete(UserSet.objects.db)
+            users.delete()
+
+    # --------------------------------------------------------------- geração
+
+    def create_users(self, total, prefix):
+        # Hash calculado uma vez: o custo do PBKDF2 por usuário dominaria o comando
+        password = make_password('helldivers')
+        user_ids = []
+        for chunk in self.chunks(total):
+            users = [
+                User(
+                    username=f'{prefix}{i}', email=f'{prefix}{i}@example.com',
+                    password=password, date_joined=self.random_datetime(),
+                )
+                for i in chunk
+            ]
+            with transaction.atomic():
+                user_ids.extend(user.pk for user in User.objects.bulk_create(users))
+            self.stdout.write(f'  usuários: {len(user_ids)}/{total}')
+        return user_ids
+
+    def create_user_sets(self, total, user_ids):
+        rng = self.rng
+        catalog = self.catalog
+        stratagems = catalog[Stratagem]
+        StratagemLink = UserSet.stratagems.through
+        LikeLink = UserSet.likes.through
+        FavoriteLink = UserSet.favorites.through
+        max_votes = len(user_ids) - 1
+
+        def optional(model, chance=0.7):
+            ids = catalog[model]
+            return rng.choice(ids) if ids and rng.random() < chance else None
+
+        created = 0
+        for chunk in self.chunks(total):
+            user_sets, voters = [], []
+            for i in chunk:
+                created_at = self.random_datetime()
+                is_public = rng.random() < 0.8
+                # Curtidas/favoritos sorteados antes do insert para gravar os contadores junto
+                likers = rng.sample(user_ids, self.popularity(max_votes)) if is_public else []
+                favoriters = rng.sample(user_ids, self.popularity(max_votes) // 2) if is_public else []
+                voters.append((likers, favoriters))
+                user_sets.append(UserSet(
+                    user_id=rng.choice(user_ids), name=f'Loadout {i}',
+                    helmet_id=rng.choice(catalog[Helmet]),
+                    armor_id=rng.choice(catalog[Armor]),
+                    cape_id=rng.choice(catalog[Cape]),
+                    primary_id=optional(PrimaryWeapon),
+                    secondary_id=optional(SecondaryWeapon),
+                    throwable_id=optional(Throwable),
+                    booster_id=optional(Booster),
+                    is_public=is_public,
+                    likes_count=len(likers), favorites_count=len(favoriters),
+                    popularity=len(likers) + len(favoriters), random_key=rng.random(),
+                    created_at=created_at, updated_at=created_at,
+                ))
+
+            with transaction.atomic():
+                UserSet.objects.bulk_create(user_sets)
+                stratagem_links, likes, favorites = [], [], []
+                for user_set, (likers, favoriters) in zip(user_sets, voters):
+                    # Votos espalhados entre a criação do set e agora (alimenta o trending)
+                    def voted_at():
+                        return user_set.created_at + (self.now - user_set.created_at) * rng.random()
+
+                    for stratagem_id in rng.sample(stratagems, min(4, len(stratagems))):
+                        stratagem_links.append(StratagemLink(userset_id=user_set.pk, stratagem_id=stratagem_id))
+                    for user_id in likers:
+                        likes.append(LikeLink(userset_id=user_set.pk, customuser_id=user_id, created_at=voted_at()))
+                    for user_id in favoriters:
+                        favorites.append(FavoriteLink(userset_id=user_set.pk, customuser_id=user_id, created_at=voted_at()))
+
+                for model, rows in ((StratagemLink, stratagem_links), (LikeLink, likes), (FavoriteLink, favorites)):
+                    model.objects.bulk_create(rows, batch_size=self.chunk_size, ignore_conflicts=True)
+
+            created += len(user_sets)
+            self.stdout.write(f'  sets: {created}/{total}')
+
+    def create_relations(self, user_ids, per_user):
+        rng = self.rng
+        for model, item_field, catalog_model in RELATION_SPECS:
+            item_ids = self.catalog[catalog_model]
+            if not item_ids:
+                continue
+            # Pares distintos (item, tipo) por usuário, respeitando o unique_together
+            pairs = [(item_id, relation_type) for item_id in item_ids for relation_type in RELATION_TYPES]
+            rows = []
+            created = 0
+            for user_id in user_ids:
+                count = min(rng.randint(0, per_user * 2), len(pairs))
+                for item_id, relation_type in rng.sample(pairs, count):
+                    rows.append(model(**{
+                        'user_id': user_id, f'{item_field}_id': item_id,
+                        'relation_type': relation_type, 'created_at': self.random_datetime(),
+                    }))
+                if len(rows) >= self.chunk_size:
+                    created += self.flush_relations(model, rows)
+            created += self.flush_relations(model, rows)
+            self.stdout.write(f'  {model._meta.verbose_name_plural}: {created}')
+
+    def flush_relations(self, model, rows):
+        if not rows:
+            return 0
+        for row in rows:
+            if hasattr(row, 'updated_at'):
+                row.updated_at = row.created_at
+        with transaction.atomic():
+            model.objects.bulk_create(rows, ignore_conflicts=True)
+        count = len(rows)
+        rows.clear()
+        return count
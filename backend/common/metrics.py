@@ -0,0 +1,154 @@
+"""
+Instrumentação por requisição da API (/api/v1/)
+
+Mede quantidade e tempo das queries SQL, tempo de serialização e tempo total
+de cada requisição, expondo os valores no header Server-Timing e em uma linha
+de log estruturada por nome de view (ex.: armorset-list, community-sets-list).
+
+O tempo de serialização exige trocar o `.data` dos serializers do DRF no
+processo inteiro, então só é medido com REQUEST_METRICS_SERIALIZERS ligado.
+A linha de log sai em INFO (REQUEST_METRICS_LOG_LEVEL=INFO para vê-la).
+"""
+
+import contextvars
+import logging
+import time
+from contextlib import ExitStack
+from functools import wraps
+
+from django.db import connections
+from rest_framework import serializers
+
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/v1/'
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Acumuladores de uma requisição"""
+    __slots__ = ('queries', 'db_time', 'serializer_time', '_serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper: conta e cronometra cada query"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def current_metrics():
+    """Métricas da requisição em andamento (None fora do middleware)"""
+    return _current.get()
+
+
+def _timed_data(fget):
+    @wraps(fget)
+    def data(self):
+        metrics = _current.get()
+        # ListSerializer.data e Serializer.data chamam BaseSerializer.data:
+        # apenas a chamada mais externa é cronometrada
+        if metrics is None or metrics._serializer_depth:
+            return fget(self)
+        metrics._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics._serializer_depth -= 1
+    return property(data)
+
+
+def _instrumented_classes():
+    from .fast_serializers import FastSerializer
+    from .normalized import Normalizer
+
+    return (serializers.BaseSerializer, serializers.Serializer, serializers.ListSerializer,
+            FastSerializer, Normalizer)
+
+
+def serializers_instrumented():
+    return getattr(serializers.BaseSerializer.data.fget, '_request_metrics', False)
+
+
+def instrument_serializers():
+    """
+    Cronometra o `.data` dos serializers do DRF, FastSerializer e Normalizer.
+    Chamado em CommonConfig.ready quando REQUEST_METRICS_SERIALIZERS está ligado.
+    """
+    for klass in _instrumented_classes():
+        prop = vars(klass)['data']
+        if not getattr(prop.fget, '_request_metrics', False):
+            timed = _timed_data(prop.fget)
+            timed.fget._request_metrics = True
+            timed.fget._original = prop
+            setattr(klass, 'data', timed)
+
+
+def uninstrument_serializers():
+    """Restaura o `.data` original dos serializers"""
+    for klass in _instrumented_classes():
+        prop = vars(klass)['data']
+        if getattr(prop.fget, '_request_metrics', False):
+            setattr(klass, 'data', prop.fget._original)
+
+
+class RequestMetricsMiddleware:
+    """
+    Adiciona Server-Timing (db, serializer, total) às respostas da API e
+    registra uma linha de log por requisição no logger common.metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(API_PREFIX):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            total = time.perf_counter() - start
+            _current.reset(token)
+
+        timings = [f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"']
+        if serializers_instrumented():
+            timings.append(f'serializer;dur={metrics.serializer_time * 1000:.1f}')
+        timings.append(f'total;dur={total * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        match = request.resolver_match
+        view_name = (match.url_name or match.view_name) if match else None
+        logger.info(
+            'api_request view=%s method=%s status=%s queries=%d db_ms=%.1f serializer_ms=%.1f total_ms=%.1f',
+            view_name, request.method, response.status_code, metrics.queries,
+            metrics.db_time * 1000, metrics.serializer_time * 1000, total * 1000,
+            extra={
+                'view_name': view_name,
+                'method': request.method,
+                'status_code': response.status_code,
+                'queries': metrics.queries,
+                'db_ms': round(metrics.db_time * 1000, 1),
+                'serializer_ms': round(metrics.serializer_time * 1000, 1),
+                'total_ms': round(total * 1000, 1),
+            },
+        )
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Modelo')),
+                ('object_id', models.BigIntegerField(verbose_name='ID do Objeto')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Excluído em')),
+            ],
+            options={
+                'verbose_name': 'Exclusão do Catálogo',
+                'verbose_name_plural': 'Exclusões do Catálogo',
+                'ordering': ['-deleted_at'],
+                'indexes': [models.Index(fields=['deleted_at'], name='common_cata_deleted_11566c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,295 @@
+"""
+Mixins compartilhados pelas ViewSets públicas do catálogo
+"""
+
+import hashlib
+from functools import cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.http import Http404
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .cache import cache_response
+from .fast_serializers import FastSerializer
+from .normalized import NormalizedJSONRenderer, normalize
+from .store import get_catalog_store
+from .versioning import GLOBAL_RESOURCE, get_version
+
+
+class ConditionalGetMixin:
+    """
+    Emite ETag/Last-Modified derivados da GlobalVersion e responde 304 a
+    If-None-Match / If-Modified-Since sem executar queryset nem serializers.
+
+    As subclasses definem `version_resource` para revalidar apenas contra a
+    família de modelos que servem (ex.: 'armory', 'stratagems').
+    """
+
+    conditional_methods = ('GET', 'HEAD')
+    version_resource = GLOBAL_RESOURCE
+
+    def get_catalog_version(self):
+        return get_version(self.version_resource)
+
+    def get_etag(self, request, version):
+        """ETag forte: versão + URL completa + negociação de conteúdo"""
+        parts = (
+            version.isoformat(),
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            request.META.get('HTTP_ACCEPT_LANGUAGE', ''),
+            request.META.get('HTTP_ACCEPT_ENCODING', ''),
+        )
+        return quote_etag(hashlib.sha1('|'.join(parts).encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.conditional_methods:
+            return super().dispatch(request, *args, **kwargs)
+
+        version = self.catalog_version = self.get_catalog_version()
+        etag = self.get_etag(request, version)
+        last_modified = int(version.timestamp())
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if self.catalog_version != version:
+                # Resposta de outra versão servida pelo cache durante a
+                # revalidação: os validadores precisam descrever o que foi enviado
+                etag = self.get_etag(request, self.catalog_version)
+                last_modified = int(self.catalog_version.timestamp())
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Força revalidação em vez de frescor heurístico pelo Last-Modified
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+@cache
+def _readable_fields(serializer_class):
+    """Campos de saída do serializer (instanciado uma vez por classe)"""
+    return {name: field for name, field in serializer_class().fields.items() if not field.write_only}
+
+
+def _split_param(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def _select_related_lookups(tree, prefix=''):
+    """{'armor': {'passive': {}}} -> ['armor', 'armor__passive']"""
+    lookups = []
+    for name, children in tree.items():
+        lookups.append(prefix + name)
+        lookups.extend(_select_related_lookups(children, f'{prefix}{name}__'))
+    return lookups
+
+
+class SparseFieldsMixin:
+    """
+    Campos esparsos nas leituras: ?fields=id,name,image ou ?omit=created_at.
+
+    Além de remover os campos da resposta, poda o queryset: select_related e
+    prefetch_related de relações não usadas são descartados e only() limita as
+    colunas às origens dos campos pedidos. SerializerMethodFields (e origens que
+    são métodos do modelo) declaram o que usam em `Meta.method_field_sources`;
+    sem a declaração o queryset é mantido como está.
+    """
+
+    sparse_fields_param = 'fields'
+    sparse_omit_param = 'omit'
+
+    def get_sparse_field_names(self, serializer_class):
+        """Campos mantidos, na ordem do serializer (None sem ?fields/?omit)"""
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        fields = _split_param(request.query_params.get(self.sparse_fields_param))
+        omit = _split_param(request.query_params.get(self.sparse_omit_param))
+        if not fields and not omit:
+            return None
+
+        available = _readable_fields(serializer_class)
+        unknown = [name for name in fields + omit if name not in available]
+        if unknown:
+            raise ValidationError({'fields': [f'Campos desconhecidos: {", ".join(unknown)}']})
+        names = tuple(name for name in available if (not fields or name in fields) and name not in omit)
+        if not names:
+            raise ValidationError({'fields': ['Nenhum campo selecionado.']})
+        return names
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+        names = self.get_sparse_field_names(type(target))
+        if names is not None:
+            for name in list(target.fields):
+                if name not in names:
+                    del target.fields[name]
+        return serializer
+
+    def filter_queryset(self, queryset):
+        return self.prune_queryset(super().filter_queryset(queryset))
+
+    def get_sparse_sources(self, serializer_class, names):
+        """Atributos do modelo lidos pelos campos mantidos (None se indeterminado)"""
+        fields = _readable_fields(serializer_class)
+        method_sources = getattr(serializer_class.Meta, 'method_field_sources', {})
+        opts = serializer_class.Meta.model._meta
+        sources = set()
+        for name in names:
+            field = fields[name]
+            if name in method_sources:
+                sources.update(method_sources[name])
+                continue
+            root = field.source.split('.')[0]
+            if isinstance(field, serializers.SerializerMethodField) or root == '*':
+                return None
+            try:
+                opts.get_field(root)
+            except FieldDoesNotExist:
+                return None  # método/propriedade do modelo: dependências desconhecidas
+            sources.add(root)
+        return sources
+
+    def prune_queryset(self, queryset):
+        serializer_class = self.get_serializer_class()
+        if queryset.model is not getattr(serializer_class.Meta, 'model', None):
+            return queryset
+        names = self.get_sparse_field_names(serializer_class)
+        sources = self.get_sparse_sources(serializer_class, names) if names is not None else None
+        if sources is None:
+            return queryset
+
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            kept = [
+                lookup for lookup in _select_related_lookups(select_related)
+                if lookup.split('__')[0] in sources
+            ]
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+
+        prefetches = queryset._prefetch_related_lookups
+        if prefetches:
+            kept = [
+                lookup for lookup in prefetches
+                if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in sources
+            ]
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+        opts = queryset.model._meta
+        columns = [opts.pk.name]
+        for name in sorted(sources):
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue  # anotação (ex.: Count): continua no SELECT
+            if field.concrete and not field.many_to_many and not field.primary_key:
+                columns.append(name)
+        return queryset.only(*columns)
+
+
+class CatalogStoreMixin(SparseFieldsMixin):
+    """
+    Serve list/retrieve a partir do store de catálogo em memória.
+
+    O banco só executa filtros, busca, ordenação e paginação sobre os IDs
+    (uma consulta sem JOINs); os objetos e seus aninhados vêm do store.
+    Escritas continuam usando o queryset normal. As respostas de list/retrieve
+    ficam no cache (ver common.cache) até a próxima versão do recurso.
+
+    Com `fast_list = True` a listagem busca as colunas do serializer direto
+    em tuplas e serializa pelo FastSerializer (ver common.fast_serializers).
+    `?format=normalized` troca os aninhados por ids + `included` (ver
+    common.normalized). ?fields=/?omit= vêm do SparseFieldsMixin e, no caminho
+    rápido, também reduzem as colunas buscadas.
+
+    Views que sobrescrevem get_queryset() (que pode restringir as linhas) têm
+    o retrieve resolvido pelo get_object(), como no DRF; o store não conhece
+    essa restrição.
+    """
+
+    fast_list = False
+
+    def get_renderers(self):
+        return super().get_renderers() + [NormalizedJSONRenderer()]
+
+    @property
+    def normalized(self):
+        return isinstance(getattr(self.request, 'accepted_renderer', None), NormalizedJSONRenderer)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['catalog_store'] = self.catalog_store
+        return context
+
+    @property
+    def catalog_store(self):
+        if not hasattr(self, '_catalog_store'):
+            self._catalog_store = get_catalog_store()
+        return self._catalog_store
+
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        if self.fast_list and not self.normalized:
+            return self.fast_list_response()
+
+        model = self.get_queryset().model
+        ids = self.filter_queryset(self.get_queryset()).values_list('pk', flat=True)
+
+        page = self.paginate_queryset(ids)
+        records = self.catalog_store.resolve(model, page if page is not None else ids)
+        serializer = self.get_serializer(records, many=True)
+        if self.normalized:
+            document = normalize(serializer)
+            if page is None:
+                return Response(document)
+            response = self.get_paginated_response(document.pop('results'))
+            response.data.update(document)
+            return response
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def fast_list_response(self):
+        serializer_class = self.get_serializer_class()
+        only = self.get_sparse_field_names(serializer_class)
+        rows = FastSerializer.values(serializer_class, self.filter_queryset(self.get_queryset()), only)
+        page = self.paginate_queryset(rows)
+        # Contexto sem o store: só os campos aninhados o carregam, e sob demanda
+        context = super().get_serializer_context()
+        data = FastSerializer(serializer_class, page if page is not None else rows, context, only).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    @property
+    def scoped_queryset(self):
+        return type(self).get_queryset is not GenericAPIView.get_queryset
+
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        if self.scoped_queryset:
+            record = self.get_object()
+        else:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            record = self.catalog_store.get(self.get_queryset().model, self.kwargs[lookup_url_kwarg])
+            if record is None:
+                raise Http404
+            self.check_object_permissions(request, record)
+        serializer = self.get_serializer(record)
+        return Response(normalize(serializer) if self.normalized else serializer.data)
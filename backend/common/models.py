@@ -1,4 +1,12 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
+
+
+# Janela da sincronização incremental: exclusões mais antigas são descartadas
+# e um `since` anterior a ela exige baixar o snapshot completo de novo
+TOMBSTONE_RETENTION = timedelta(days=30)
 
 
 class GlobalVersion(models.Model):
@@ -11,3 +19,35 @@ class GlobalVersion(models.Model):
     
     def __str__(self):
         return f"{self.resource}: {self.updated_at}"
+
+
+class CatalogTombstone(models.Model):
+    """
+    Registro de exclusão de um item do catálogo, usado pela sincronização
+    incremental (/api/v1/catalog/changes/) para informar remoções aos clientes.
+    """
+    model = models.CharField(max_length=100, verbose_name="Modelo")  # app_label.model_name
+    object_id = models.BigIntegerField(verbose_name="ID do Objeto")
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name="Excluído em")
+
+    class Meta:
+        verbose_name = "Exclusão do Catálogo"
+        verbose_name_plural = "Exclusões do Catálogo"
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id} ({self.deleted_at})"
+
+    @classmethod
+    def retention_cutoff(cls, now=None):
+        """Exclusões antes deste instante já podem ter sido descartadas"""
+        return (now or timezone.now()) - TOMBSTONE_RETENTION
+
+    @classmethod
+    def prune(cls, using=None, now=None):
+        """Remove os registros fora da retenção. Retorna quantos saíram."""
+        deleted, _ = cls.objects.using(using).filter(deleted_at__lt=cls.retention_cutoff(now)).delete()
+        return deleted
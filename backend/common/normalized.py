@@ -0,0 +1,118 @@
+"""
+Modo de resposta normalizado (?format=normalized) das ViewSets do catálogo
+
+Em vez de repetir o mesmo warbond/passiva/fonte em cada linha, os campos
+aninhados (serializers e CatalogRelatedField) viram o id do objeto e cada
+objeto referenciado é serializado uma única vez em `included`:
+
+    {
+      "count": 42, "next": ..., "previous": ...,
+      "results": [{"id": 1, "name": "...", "armor_detail": 7, "pass_detail": 3, ...}],
+      "included": {
+        "armors": {"7": {"id": 7, "passive_detail": 2, "pass_detail": 3, ...}},
+        "passives": {"2": {...}},
+        "warbonds": {"3": {...}}
+      },
+      "references": {
+        "armor_sets": {"armor_detail": "armors", "pass_detail": "warbonds", ...},
+        "armors": {"passive_detail": "passives", "pass_detail": "warbonds"}
+      }
+    }
+
+`references` diz, por tipo, qual coleção de `included` cada campo aponta.
+Respostas de detalhe usam "result" no lugar de "results".
+"""
+
+import re
+
+from django.db.models import Manager
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.renderers import JSONRenderer
+
+from .store import CatalogRelatedField
+
+
+class NormalizedJSONRenderer(JSONRenderer):
+    """JSON comum; o formato só sinaliza à view que a resposta deve ser normalizada"""
+    format = 'normalized'
+
+
+def entity_key(model):
+    """Nome da coleção em `included` (ex.: AcquisitionSource -> acquisition_sources)"""
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', model.__name__).lower() + 's'
+
+
+class Normalizer:
+    """Serializa uma ou mais instâncias substituindo aninhados por ids"""
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self.included = {}
+        self.references = {}
+
+    @property
+    def data(self):
+        """Documento normalizado (results/result + included + references)"""
+        serializer = self.serializer
+        if isinstance(serializer, serializers.ListSerializer):
+            child = serializer.child
+            results = [self.represent(child, item) for item in self.iterate(serializer.instance)]
+            document = {'results': results}
+        else:
+            child = serializer
+            document = {'result': self.represent(child, serializer.instance)}
+        document['included'] = self.included
+        document['references'] = {key: value for key, value in self.references.items() if value}
+        return document
+
+    @staticmethod
+    def iterate(data):
+        return data.all() if isinstance(data, Manager) else data
+
+    def represent(self, serializer, instance):
+        """Equivalente a Serializer.to_representation, com os aninhados normalizados"""
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            # Representação customizada: mantida como está (sem aninhados a normalizar)
+            return serializer.to_representation(instance)
+
+        references = self.references.setdefault(entity_key(serializer.Meta.model), {})
+        ret = {}
+        for field in serializer._readable_fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+
+            many = isinstance(field, serializers.ListSerializer)
+            if many or isinstance(field, CatalogRelatedField):
+                child = field.child
+            elif isinstance(field, serializers.BaseSerializer):
+                child = field
+            else:
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+                continue
+
+            references[field.field_name] = entity_key(child.Meta.model)
+            if attribute is None:
+                ret[field.field_name] = None
+            elif many:
+                ret[field.field_name] = [self.include(child, item) for item in self.iterate(attribute)]
+            else:
+                ret[field.field_name] = self.include(child, attribute)
+        return ret
+
+    def include(self, serializer, instance):
+        """Registra o objeto em `included` (uma vez por tipo/id) e retorna o id"""
+        bucket = self.included.setdefault(entity_key(serializer.Meta.model), {})
+        key = str(instance.pk)
+        if key not in bucket:
+            bucket[key] = None  # protege contra ciclos entre aninhados
+            bucket[key] = self.represent(serializer, instance)
+        return instance.pk
+
+
+def normalize(serializer):
+    return Normalizer(serializer).data
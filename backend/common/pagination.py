@@ -0,0 +1,152 @@
+"""
+Paginação por cursor (keyset) seguindo a ordenação ativa do queryset
+
+Ao contrário do CursorPagination do DRF (posição em um único campo + offset
+nos empates), o cursor guarda os valores de todos os campos da ordenação, com
+a pk como desempate final, e a próxima página é um filtro
+
+    (a, b, pk) "depois de" (va, vb, vpk)  ->  a <= va AND (a < va OR (a = va AND (b < vb OR ...)))
+
+que uma varredura do índice (a, b, pk) atende sem OFFSET e sem COUNT(*): a
+página 500 custa o mesmo que a primeira. A ordenação é a que o queryset já
+tem (get_queryset, OrderingFilter ou Meta.ordering), então ?ordering= continua
+valendo; trocar a ordenação invalida os cursores antigos.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def _reverse_ordering(ordering):
+    return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor com a posição completa (todos os campos da ordenação + pk)"""
+
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def get_ordering(self, request, queryset, view):
+        """Ordenação ativa do queryset, com a pk no fim como desempate"""
+        query = queryset.query
+        ordering = query.order_by or (query.get_meta().ordering if query.default_ordering else ())
+        names = []
+        for name in ordering:
+            if not isinstance(name, str) or name == '?' or '__' in name:
+                raise ImproperlyConfigured(f'KeysetPagination não suporta a ordenação {name!r}')
+            names.append(name)
+
+        pk_name = queryset.model._meta.pk.name
+        names = [name.replace('pk', pk_name) if name.lstrip('-') == 'pk' else name for name in names]
+        if not any(name.lstrip('-') == pk_name for name in names):
+            # Mesmo sentido do último campo: o índice (..., campo DESC, id DESC) serve a ordenação inteira
+            descending = bool(names) and names[-1].startswith('-')
+            names.append(f'-{pk_name}' if descending else pk_name)
+        return tuple(names)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        reverse, position = self.decode_cursor(request) or (False, None)
+
+        queryset = self.load_ordering_fields(queryset)
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+
+        # Links apontam para as bordas da página: depois da última / antes da primeira
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = (position is not None) if not reverse else has_more
+        if self.page:
+            self.next_position = self.position(self.page[-1])
+            self.previous_position = self.position(self.page[0])
+        else:
+            self.has_next = self.has_previous = False
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def load_ordering_fields(self, queryset):
+        """Garante que os campos da posição venham na query (only()/defer() dos campos esparsos)"""
+        names = {name.lstrip('-') for name in self.ordering}
+        fields, deferred = queryset.query.deferred_loading
+        if not fields:
+            return queryset
+        if not deferred:
+            return queryset.only(*fields, *names)
+        if fields & names:
+            return queryset.defer(None).defer(*(fields - names))
+        return queryset
+
+    def after(self, ordering, position):
+        """Q das linhas depois de `position` na ordenação (com limite no 1º campo para o índice)"""
+        condition = None
+        for index in reversed(range(len(ordering))):
+            name = ordering[index].lstrip('-')
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': position[index]})
+            if condition is not None:
+                step |= Q(**{name: position[index]}) & condition
+            condition = step
+        first = ordering[0].lstrip('-')
+        bound = 'lte' if ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{first}__{bound}': position[0]}) & condition
+
+    def position(self, instance):
+        opts = self.model._meta
+        return [opts.get_field(name.lstrip('-')).value_to_string(instance) for name in self.ordering]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            raw = payload['p']
+            if not isinstance(raw, list) or len(raw) != len(self.ordering):
+                raise ValueError
+            opts = self.model._meta
+            position = [
+                opts.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, raw)
+            ]
+            return bool(payload.get('r')), position
+        except (BinasciiError, UnicodeError, ValueError, TypeError, KeyError,
+                FieldDoesNotExist, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, reverse, position):
+        payload = {'p': position}
+        if reverse:
+            payload['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        return self.encode_cursor(False, self.next_position) if self.has_next else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(True, self.previous_position) if self.has_previous else None
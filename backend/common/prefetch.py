@@ -0,0 +1,100 @@
+"""
+Plano de select_related/prefetch_related derivado dos campos de um serializer
+
+O serializer já declara o que vai ler: serializers aninhados e origens
+pontuadas ('user.username') por FK viram select_related; relações para muitos
+(many=True, PrimaryKeyRelatedField many) viram prefetch_related, com o plano do
+serializer filho aplicado ao queryset do Prefetch. CatalogRelatedField não
+entra no plano (vem do store de catálogo) e PrimaryKeyRelatedField simples só
+lê a coluna da FK.
+
+    queryset = prefetch_plan(UserSetSerializer).apply(UserSet.objects.all())
+
+SerializerMethodFields não são analisados; o que eles leem continua por conta
+da view.
+"""
+
+from functools import cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .store import CatalogRelatedField
+
+
+class PrefetchPlan:
+    """Lookups de select_related e prefetch_related (com planos aninhados) de um serializer"""
+
+    def __init__(self, serializer_class):
+        self.model = serializer_class.Meta.model
+        self.select_related = []
+        self.prefetches = {}  # lookup -> PrefetchPlan do filho (ou None)
+        self.collect(serializer_class(), self.model, '')
+
+    def collect(self, serializer, model, prefix):
+        for field in serializer.fields.values():
+            if field.write_only or field.source == '*' or isinstance(field, CatalogRelatedField):
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                nested = field.child
+            elif isinstance(field, serializers.BaseSerializer):
+                nested = field
+            else:
+                nested = None
+            self.collect_field(field, nested, model, prefix)
+
+    def collect_field(self, field, nested, model, prefix):
+        attrs = field.source_attrs
+        for position, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return  # método/propriedade do modelo
+            if not model_field.is_relation:
+                return
+            last = position == len(attrs) - 1
+            lookup = prefix + attr
+
+            if model_field.many_to_many or model_field.one_to_many:
+                child_plan = prefetch_plan(type(nested)) if last and nested is not None else None
+                if self.prefetches.get(lookup) is None:
+                    self.prefetches[lookup] = child_plan if child_plan and not child_plan.empty else None
+                return
+            if last and nested is None:
+                return  # FK como id: a coluna já está na linha
+
+            if lookup not in self.select_related:
+                self.select_related.append(lookup)
+            model = model_field.related_model
+            prefix = lookup + '__'
+            if last:
+                self.collect(nested, model, prefix)
+
+    @property
+    def empty(self):
+        return not self.select_related and not self.prefetches
+
+    def prefetch_lookups(self):
+        """Lookups para prefetch_related (Prefetch novo a cada chamada; o queryset não é compartilhado)"""
+        lookups = []
+        for lookup, child_plan in self.prefetches.items():
+            if child_plan is None:
+                lookups.append(lookup)
+            else:
+                queryset = child_plan.apply(child_plan.model._default_manager.all())
+                lookups.append(Prefetch(lookup, queryset=queryset))
+        return lookups
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetches:
+            queryset = queryset.prefetch_related(*self.prefetch_lookups())
+        return queryset
+
+
+@cache
+def prefetch_plan(serializer_class):
+    """Plano compilado (e reutilizado) para o ModelSerializer"""
+    return PrefetchPlan(serializer_class)
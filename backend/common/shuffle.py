@@ -0,0 +1,160 @@
+"""
+Ordem aleatória paginável por cursor a partir de uma coluna de chave aleatória
+
+Cada linha guarda uma chave uniforme k em [0, 1) (sorteada na criação). A
+semente corta [0, 1) em 3 a 6 faixas, com os pontos de corte sorteados dela,
+e cada faixa é esticada para [0, 1): a ordem é a de
+
+    (k - início da faixa) / largura da faixa, depois faixa, k e pk como desempate
+
+ou seja, uma intercalação das faixas em que cada uma segue k crescente. Como
+os cortes vêm da semente, sementes diferentes (mesmo com o mesmo número de
+faixas) mudam os vizinhos de cada item: não é a rotação de uma ordem fixa.
+
+Cada página é uma fusão das faixas: por faixa, uma varredura de intervalo no
+índice (chave, pk) a partir do cursor, com LIMIT do tamanho da página. Sem
+COUNT(*) e sem OFFSET, a página 500 custa o mesmo que a primeira. O cursor é
+o mesmo do KeysetPagination: a posição (chave, pk) da borda da página.
+"""
+
+import hashlib
+import struct
+from bisect import bisect_right
+
+from django.db.models import Q
+
+from .pagination import KeysetPagination
+
+
+# Faixas por semente: cada página consulta uma vez cada faixa
+MIN_BANDS, MAX_BANDS = 3, 6
+
+
+def _seed_fraction(seed, salt):
+    """Fração determinística em [0, 1) para a semente (qualquer string)"""
+    digest = hashlib.blake2b(f'{salt}:{seed}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64
+
+
+def _float_bits(value):
+    # Para floats não negativos a representação inteira cresce junto com o valor
+    return struct.unpack('<q', struct.pack('<d', value))[0]
+
+
+def _bits_float(bits):
+    return struct.unpack('<d', struct.pack('<q', bits))[0]
+
+
+def _first_key(predicate):
+    """
+    Menor float em [0, 1] em que `predicate` (monótono) vale; 1.0 se nenhum.
+    Bissecção sobre a representação dos floats: no máximo 62 passos.
+    """
+    if predicate(0.0):
+        return 0.0
+    low, high = _float_bits(0.0), _float_bits(1.0)
+    if not predicate(1.0):
+        return 1.0
+    while high - low > 1:
+        middle = (low + high) // 2
+        if predicate(_bits_float(middle)):
+            high = middle
+        else:
+            low = middle
+    return _bits_float(high)
+
+
+class SeededOrder:
+    """Ordem de uma semente sobre chaves em [0, 1), dividida em faixas de chave"""
+
+    def __init__(self, seed):
+        count = MIN_BANDS + int(_seed_fraction(seed, 'bands') * (MAX_BANDS - MIN_BANDS + 1))
+        cuts = sorted(_seed_fraction(seed, f'cut:{index}') for index in range(count - 1))
+        bounds = [0.0, *cuts, 1.0]
+        self.ranges = [
+            (index, lower, upper) for index, (lower, upper) in enumerate(zip(bounds, bounds[1:])) if lower < upper
+        ]
+        self.lowers = [lower for _, lower, _ in self.ranges]
+
+    def band(self, key):
+        """Faixa (índice, início, fim) que contém a chave"""
+        return self.ranges[max(bisect_right(self.lowers, key) - 1, 0)]
+
+    @staticmethod
+    def progress(key, lower, upper):
+        return (key - lower) / (upper - lower)
+
+    def sort_key(self, key, pk):
+        index, lower, upper = self.band(key)
+        return (self.progress(key, lower, upper), index, key, pk)
+
+    def threshold(self, index, lower, upper, position):
+        """Menor chave da faixa `index` que vem depois de `position` (de outra faixa)"""
+        key, _ = position
+        own, own_lower, own_upper = self.band(key)
+        progress = self.progress(key, own_lower, own_upper)
+        if index > own:
+            # Empate no progresso: a faixa de índice maior vem depois
+            return _first_key(lambda k: self.progress(k, lower, upper) >= progress)
+        return _first_key(lambda k: self.progress(k, lower, upper) > progress)
+
+    def range_filter(self, name, index, lower, upper, position, reverse):
+        """Q das linhas da faixa depois (ou antes, no reverso) de `position`"""
+        condition = Q(**{f'{name}__gte': lower, f'{name}__lt': upper})
+        if position is None:
+            return condition
+        key, pk = position
+        if lower <= key < upper:
+            lookup = 'lt' if reverse else 'gt'
+            return condition & (Q(**{f'{name}__{lookup}': key}) | Q(**{name: key, f'pk__{lookup}': pk}))
+        threshold = self.threshold(index, lower, upper, position)
+        return condition & Q(**{f'{name}__lt' if reverse else f'{name}__gte': threshold})
+
+
+class SeededShufflePagination(KeysetPagination):
+    """KeysetPagination na ordem de uma semente sobre a coluna de chave aleatória"""
+
+    def __init__(self, seed, key='random_key'):
+        self.order = SeededOrder(seed)
+        self.key = key
+
+    def get_ordering(self, request, queryset, view):
+        return (self.key, queryset.model._meta.pk.name)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        reverse, position = self.decode_cursor(request) or (False, None)
+
+        # Uma varredura curta por faixa (só chave e pk), fundidas na ordem da semente
+        scan = queryset.order_by(*((f'-{self.key}', '-pk') if reverse else (self.key, 'pk'))).prefetch_related(None)
+        candidates = []
+        for index, lower, upper in self.order.ranges:
+            condition = self.order.range_filter(self.key, index, lower, upper, position, reverse)
+            candidates.extend(scan.filter(condition).values_list(self.key, 'pk')[:self.page_size + 1])
+        candidates.sort(key=lambda row: self.order.sort_key(*row), reverse=reverse)
+
+        rows = candidates[:self.page_size]
+        has_more = len(candidates) > self.page_size
+        if reverse:
+            rows.reverse()
+        objects = self.load_ordering_fields(queryset.order_by()).in_bulk([pk for _, pk in rows])
+        self.page = [objects[pk] for _, pk in rows]
+
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = (position is not None) if not reverse else has_more
+        if self.page:
+            self.next_position = self.position(self.page[-1])
+            self.previous_position = self.position(self.page[0])
+        else:
+            self.has_next = self.has_previous = False
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
@@ -1,30 +1,82 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models import SET_DEFAULT, SET_NULL
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import GlobalVersion
+from django.utils import timezone
+from .models import CatalogTombstone
+from .versioning import schedule_version_bump
 
 # Import content models to monitor
 from armory.models import Armor, Helmet, Cape, ArmorSet, Passive
 from weaponry.models import PrimaryWeapon, SecondaryWeapon, Throwable
 from stratagems.models import Stratagem
-from warbonds.models import Warbond
+from warbonds.models import Warbond, AcquisitionSource
 from booster.models import Booster
 
-MODELS_TO_MONITOR = [
-    Armor, Helmet, Cape, ArmorSet, Passive,
-    PrimaryWeapon, SecondaryWeapon, Throwable,
-    Stratagem,
-    Warbond,
-    Booster
-]
+# One version row per monitored model family (see common.versioning.RESOURCES)
+RESOURCE_MODELS = {
+    'armory': [Armor, Helmet, Cape, ArmorSet, Passive],
+    'weaponry': [PrimaryWeapon, SecondaryWeapon, Throwable],
+    'stratagems': [Stratagem],
+    'warbonds': [Warbond, AcquisitionSource],
+    'boosters': [Booster],
+}
+
+MODELS_TO_MONITOR = {
+    model: resource
+    for resource, models in RESOURCE_MODELS.items()
+    for model in models
+}
 
 @receiver(post_save)
 @receiver(post_delete)
 def global_update_handler(sender, **kwargs):
     """
-    Updates the global version timestamp whenever a monitored model is changed.
+    Updates the version timestamp of the changed model family (plus its
+    dependents and the global row) whenever a monitored model is changed.
+    The bump is deferred to transaction commit and coalesced per resource.
+    """
+    resource = MODELS_TO_MONITOR.get(sender)
+    if resource:
+        schedule_version_bump([resource], using=kwargs.get('using'))
+
+
+def nullified_dependents(model):
+    """Reverse relations from monitored models that SET_NULL/SET_DEFAULT when `model` is deleted"""
+    return [
+        rel for rel in model._meta.get_fields(include_hidden=True)
+        if rel.auto_created and not rel.concrete and not rel.many_to_many
+        and rel.related_model in MODELS_TO_MONITOR
+        and rel.on_delete in (SET_NULL, SET_DEFAULT)
+    ]
+
+
+@receiver(pre_delete)
+def catalog_dependents_handler(sender, instance, **kwargs):
+    """
+    Touches updated_at of the catalog rows that reference a deleted catalog
+    row. The collector clears their foreign keys with a bulk UPDATE that
+    skips auto_now, so without this the delta-sync endpoint never reports them.
+    """
+    if sender not in MODELS_TO_MONITOR:
+        return
+    now = timezone.now()
+    for rel in nullified_dependents(sender):
+        rel.related_model._base_manager.using(kwargs.get('using')).filter(
+            **{rel.field.name: instance}
+        ).update(updated_at=now)
+
+
+@receiver(post_delete)
+def catalog_tombstone_handler(sender, instance, **kwargs):
+    """
+    Records a tombstone for every deleted catalog row, so the delta-sync
+    endpoint can tell clients which cached items must be dropped. Tombstones
+    older than the retention window are pruned on the way.
     """
     if sender in MODELS_TO_MONITOR:
-        GlobalVersion.objects.update_or_create(
-            resource='global',
-            defaults={}  # auto_now=True on updated_at handles the timestamp
+        using = kwargs.get('using')
+        CatalogTombstone.objects.using(using).create(
+            model=sender._meta.label_lower,
+            object_id=instance.pk,
         )
+        CatalogTombstone.prune(using=using)
@@ -0,0 +1,222 @@
+"""
+Store de catálogo em memória (somente leitura, local ao processo)
+
+Carrega todas as linhas de armory/weaponry/stratagems/booster/warbonds em
+objetos compactos com __slots__, com índices id -> objeto e chaves
+estrangeiras já resolvidas entre si. O store inteiro é substituído
+atomicamente quando a versão global muda; nunca é alterado no lugar.
+"""
+
+import inspect
+import threading
+from functools import cache
+
+from django.db.models import ImageField, Model
+from django.db.models.fields.files import ImageFieldFile
+from django.utils.encoding import force_str
+from rest_framework import serializers
+
+from armory.models import Armor, Helmet, Cape, ArmorSet, Passive
+from weaponry.models import PrimaryWeapon, SecondaryWeapon, Throwable
+from stratagems.models import Stratagem
+from booster.models import Booster
+from warbonds.models import Warbond, AcquisitionSource
+
+from .versioning import get_version
+
+
+STORE_MODELS = (
+    Warbond, AcquisitionSource, Passive,
+    Armor, Helmet, Cape, ArmorSet,
+    PrimaryWeapon, SecondaryWeapon, Throwable,
+    Stratagem, Booster,
+)
+
+
+class CatalogRecord:
+    """Base dos registros imutáveis do store (uma subclasse por modelo)"""
+    __slots__ = ()
+    _attnames = {}
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} é somente leitura")
+
+    @property
+    def pk(self):
+        return self.id
+
+    def serializable_value(self, field_name):
+        """Equivalente a Model.serializable_value (usado pelos PrimaryKeyRelatedField do DRF)"""
+        return getattr(self, self._attnames.get(field_name, field_name))
+
+    def __str__(self):
+        return getattr(self, 'name', f'#{self.id}')
+
+
+def _display_getter(attname, choices):
+    def get_display(self):
+        value = getattr(self, attname)
+        return force_str(choices.get(value, value), strings_only=True)
+    return get_display
+
+
+@cache
+def _record_class(model):
+    """Cria a classe de registro do modelo: slots por campo + métodos de leitura"""
+    fields = [field for field in model._meta.concrete_fields]
+    slots = [field.attname for field in fields]
+    slots += [field.name for field in fields if field.is_relation and field.related_model in STORE_MODELS]
+
+    namespace = {
+        '__slots__': tuple(slots),
+        '_attnames': {field.name: field.attname for field in fields},
+    }
+    for field in fields:
+        if field.choices:
+            namespace[f'get_{field.name}_display'] = _display_getter(field.attname, dict(field.flatchoices))
+
+    # Métodos de leitura declarados no modelo (get_cost_currency, get_total_cost...)
+    for klass in reversed(model.__mro__):
+        if issubclass(klass, Model) and klass is not Model:
+            for name, value in vars(klass).items():
+                if name.startswith('get_') and inspect.isfunction(value):
+                    namespace[name] = value
+
+    return type(f'{model.__name__}Record', (CatalogRecord,), namespace)
+
+
+class CatalogStore:
+    """Snapshot imutável do catálogo: registros e índices por modelo"""
+    __slots__ = ('version', 'records', 'indexes', 'sets_by_component')
+
+    def __init__(self, version, records):
+        self.version = version
+        self.records = records
+        self.indexes = {
+            model: {record.id: record for record in rows}
+            for model, rows in records.items()
+        }
+        self.sets_by_component = {}
+        for armor_set in records[ArmorSet]:
+            for component in ('helmet', 'armor', 'cape'):
+                component_id = getattr(armor_set, f'{component}_id')
+                if component_id is not None:
+                    key = (component, component_id)
+                    self.sets_by_component[key] = self.sets_by_component.get(key, ()) + (armor_set,)
+
+    def all(self, model):
+        return self.records.get(model, ())
+
+    def get(self, model, pk):
+        try:
+            return self.indexes[model].get(int(pk))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def resolve(self, model, ids):
+        """Converte uma sequência de IDs nos registros correspondentes (mantendo a ordem)"""
+        index = self.indexes.get(model, {})
+        return [index[pk] for pk in ids if pk in index]
+
+    def sets_containing(self, component, component_id):
+        """Sets que usam o capacete/armadura/capa informado"""
+        return self.sets_by_component.get((component, component_id), ())
+
+
+def build_catalog_store(version):
+    """Carrega todas as tabelas do catálogo e resolve as FKs entre os registros"""
+    raw = {}
+    for model in STORE_MODELS:
+        record_class = _record_class(model)
+        fields = list(model._meta.concrete_fields)
+        rows = []
+        for values in model._base_manager.order_by(*model._meta.ordering or ('pk',)).values_list(
+            *[field.attname for field in fields]
+        ):
+            record = object.__new__(record_class)
+            for field, value in zip(fields, values):
+                if isinstance(field, ImageField):
+                    value = ImageFieldFile(None, field, value or None)
+                object.__setattr__(record, field.attname, value)
+            rows.append(record)
+        raw[model] = (fields, rows)
+
+    indexes = {model: {record.id: record for record in rows} for model, (fields, rows) in raw.items()}
+    for model, (fields, rows) in raw.items():
+        relations = [
+            field for field in fields
+            if field.is_relation and field.related_model in STORE_MODELS
+        ]
+        for record in rows:
+            for field in relations:
+                related_id = getattr(record, field.attname)
+                related = indexes[field.related_model].get(related_id) if related_id is not None else None
+                object.__setattr__(record, field.name, related)
+
+    return CatalogStore(version, {model: tuple(rows) for model, (fields, rows) in raw.items()})
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_catalog_store():
+    """
+    Retorna o store da versão global atual, reconstruindo-o se a versão mudou.
+    A troca é atômica: leitores em andamento continuam com o store anterior,
+    e as demais threads também o recebem enquanto uma delas reconstrói.
+    """
+    global _store
+    version = get_version()
+    store = _store
+    if store is not None and store.version == version:
+        return store
+
+    if store is None:
+        _store_lock.acquire()
+    elif not _store_lock.acquire(blocking=False):
+        return store
+
+    try:
+        if _store is None or _store.version != version:
+            _store = build_catalog_store(version)
+        return _store
+    finally:
+        _store_lock.release()
+
+
+class CatalogRelatedField(serializers.Field):
+    """
+    Campo aninhado somente leitura que resolve a FK (ex.: pass_field_id) pelo
+    store em vez de um JOIN/consulta ao banco. Cai para o ORM se o registro
+    ainda não estiver no store (ex.: criado na transação corrente).
+    """
+
+    def __init__(self, serializer, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.child = serializer
+        self.child.bind(field_name='', parent=self)
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self.related_model = parent.Meta.model._meta.get_field(self.source).related_model
+
+    def get_attribute(self, instance):
+        if isinstance(instance, CatalogRecord):
+            # Registros do store já carregam a FK resolvida
+            return getattr(instance, self.source)
+
+        related_id = getattr(instance, f'{self.source}_id')
+        if related_id is None:
+            return None
+
+        # O store fica no contexto da raiz para não reconsultar a versão por linha
+        context = self.context
+        store = context.get('catalog_store')
+        if store is None:
+            store = context['catalog_store'] = get_catalog_store()
+        return store.get(self.related_model, related_id) or getattr(instance, self.source)
+
+    def to_representation(self, value):
+        return self.child.to_representation(value)
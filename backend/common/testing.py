@@ -0,0 +1,139 @@
+"""
+Utilitários compartilhados pelos testes de orçamento de queries
+
+seed_catalog() cria um catálogo pequeno mas representativo (todas as FKs
+aninhadas preenchidas), e QueryBudgetMixin mede cada endpoint sem cache,
+falhando quando uma mudança reintroduz N+1 ou estoura o tempo de serialização.
+"""
+
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from armory.models import Armor, Helmet, Cape, ArmorSet, Passive, UserSet
+from weaponry.models import PrimaryWeapon, SecondaryWeapon, Throwable
+from stratagems.models import Stratagem
+from booster.models import Booster
+from warbonds.models import Warbond, AcquisitionSource
+
+from .metrics import instrument_serializers, serializers_instrumented, uninstrument_serializers
+from .store import get_catalog_store
+
+
+# Linhas por modelo: maior que os orçamentos por item, então um N+1 estoura
+SEED_ROWS = 5
+
+_SERIALIZER_TIMING = re.compile(r'serializer;dur=([\d.]+)')
+
+
+def seed_catalog(rows=SEED_ROWS):
+    """Cria `rows` itens de cada modelo do catálogo com todas as FKs preenchidas"""
+    catalog = {}
+    catalog['warbonds'] = [
+        Warbond.objects.create(name=f'Warbond {i}', image=f'warbonds/{i}.png') for i in range(rows)
+    ]
+    catalog['sources'] = [AcquisitionSource.objects.create(name=f'Source {i}') for i in range(rows)]
+    catalog['passives'] = [
+        Passive.objects.create(name=f'Passive {i}', description='-', effect='-') for i in range(rows)
+    ]
+
+    def shop_fields(i):
+        return {
+            'source': 'pass',
+            'pass_field': catalog['warbonds'][i],
+            'acquisition_source': catalog['sources'][i],
+            'image': f'armory/{i}.png',
+        }
+
+    catalog['armors'] = [
+        Armor.objects.create(name=f'Armor {i}', armor=100, speed=500, stamina=100,
+                             passive=catalog['passives'][i], **shop_fields(i))
+        for i in range(rows)
+    ]
+    catalog['helmets'] = [Helmet.objects.create(name=f'Helmet {i}', **shop_fields(i)) for i in range(rows)]
+    catalog['capes'] = [Cape.objects.create(name=f'Cape {i}', **shop_fields(i)) for i in range(rows)]
+    catalog['sets'] = [
+        ArmorSet.objects.create(name=f'Set {i}', helmet=catalog['helmets'][i],
+                                armor=catalog['armors'][i], cape=catalog['capes'][i])
+        for i in range(rows)
+    ]
+
+    for key, model, weapon_type in (
+        ('primaries', PrimaryWeapon, 'assault_rifle'),
+        ('secondaries', SecondaryWeapon, 'pistol'),
+        ('throwables', Throwable, 'standard'),
+    ):
+        catalog[key] = [
+            model.objects.create(name=f'{model.__name__} {i}', weapon_type=weapon_type,
+                                 acquisition_source=catalog['sources'][i],
+                                 warbond=catalog['warbonds'][i])
+            for i in range(rows)
+        ]
+
+    catalog['stratagems'] = [
+        Stratagem.objects.create(name=f'Stratagem {i}', department='hangar', codex='↑↓', warbond=catalog['warbonds'][i])
+        for i in range(rows)
+    ]
+    catalog['boosters'] = [
+        Booster.objects.create(name=f'Booster {i}', warbond=catalog['warbonds'][i]) for i in range(rows)
+    ]
+    return catalog
+
+
+def seed_user_sets(users, catalog, public=True):
+    """Cria um loadout completo por item do catálogo, com curtidas e favoritos de todos os usuários"""
+    user_sets = []
+    for i, helmet in enumerate(catalog['helmets']):
+        user_set = UserSet.objects.create(
+            user=users[i % len(users)], name=f'Loadout {i}', is_public=public,
+            helmet=helmet, armor=catalog['armors'][i], cape=catalog['capes'][i],
+            primary=catalog['primaries'][i], secondary=catalog['secondaries'][i],
+            throwable=catalog['throwables'][i], booster=catalog['boosters'][i],
+        )
+        user_set.stratagems.set(catalog['stratagems'][:4])
+        user_set.likes.set(users)
+        user_set.favorites.set(users)
+        user_sets.append(user_set)
+    return user_sets
+
+
+class QueryBudgetMixin:
+    """
+    Asserções de orçamento por endpoint (para subclasses de TestCase).
+
+    O orçamento de serialização é generoso de propósito: serve para pegar
+    regressões de ordem de grandeza, não variações do ambiente de CI. Os
+    serializers são cronometrados durante o teste mesmo com
+    REQUEST_METRICS_SERIALIZERS desligado.
+    """
+
+    serializer_budget_ms = 250
+
+    def warm_catalog_store(self):
+        """Carrega o store fora da medição (ele é reconstruído só por versão)"""
+        get_catalog_store()
+
+    def assertWithinBudget(self, url, max_queries, serializer_budget_ms=None, **extra):
+        cache.clear()  # mede o caminho completo, sem o cache de respostas
+        if not serializers_instrumented():
+            instrument_serializers()
+            self.addCleanup(uninstrument_serializers)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200, url)
+
+        executed = len(queries)
+        self.assertLessEqual(
+            executed, max_queries,
+            f'{url}: {executed} queries (orçamento {max_queries})\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries),
+        )
+
+        budget = self.serializer_budget_ms if serializer_budget_ms is None else serializer_budget_ms
+        match = _SERIALIZER_TIMING.search(response.get('Server-Timing', ''))
+        if not match:
+            self.fail(f'{url}: Server-Timing sem a entrada serializer ({response.get("Server-Timing")!r})')
+        self.assertLessEqual(float(match.group(1)), budget, f'{url}: serialização acima de {budget}ms')
+        return response
@@ -0,0 +1,604 @@
+import gzip
+import json
+import math
+from datetime import timedelta
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from django.core.cache import cache
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+
+from armory.models import Armor, ArmorSet, Cape, Helmet, Passive, UserSet
+from armory.serializers import ArmorSerializer, ArmorListSerializer
+from stratagems.models import Stratagem
+from stratagems.serializers import StratagemSerializer
+from weaponry.models import PrimaryWeapon, SecondaryWeapon, Throwable
+from weaponry.serializers import PrimaryWeaponSerializer, SecondaryWeaponSerializer, ThrowableSerializer
+from common.models import TOMBSTONE_RETENTION, CatalogTombstone, GlobalVersion
+from common.cache import COMPRESSORS, get_or_build
+from common.fast_serializers import FastSerializer, compile_serializer
+from common.metrics import instrument_serializers, serializers_instrumented, uninstrument_serializers
+from common.capture import anonymize_user, read_capture
+from common.loadtest import load_scenario
+from common.shuffle import _first_key
+from common.store import get_catalog_store
+from common.testing import QueryBudgetMixin, seed_catalog, seed_user_sets
+from common.versioning import deferred_version_bumps
+from warbonds.models import AcquisitionSource, Warbond
+from booster.models import Booster
+from booster.views import BoosterViewSet
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = '/api/v1/catalog/snapshot/'
+        with self.captureOnCommitCallbacks(execute=True):
+            Warbond.objects.create(name='Helldivers Mobilize')
+            Passive.objects.create(name='Padded', description='-', effect='+armor')
+
+    def test_snapshot_contains_all_sections(self):
+        """Testa se o snapshot traz todas as seções do catálogo"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for key in ('armors', 'helmets', 'capes', 'passives', 'sets', 'primary_weapons',
+                    'secondary_weapons', 'throwables', 'stratagems', 'boosters',
+                    'warbonds', 'acquisition_sources'):
+            self.assertIn(key, response.data)
+        self.assertEqual(len(response.data['warbonds']), 1)
+
+    def test_snapshot_is_cached_until_version_bump(self):
+        """Testa se o snapshot é reconstruído apenas após um bump de versão"""
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Warbond.objects.create(name='Cutting Edge')
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['warbonds']), 2)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = '/api/v1/warbonds/warbonds/'
+        with self.captureOnCommitCallbacks(execute=True):
+            Warbond.objects.create(name='Helldivers Mobilize')
+
+    def test_list_emits_validators(self):
+        """Testa se as listagens do catálogo emitem ETag e Last-Modified"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_if_none_match_returns_304_without_queries_beyond_version(self):
+        """Testa se a revalidação responde 304 sem serializar"""
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bump_invalidates_etag(self):
+        """Testa se um bump de versão gera um novo ETag"""
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Warbond.objects.create(name='Cutting Edge')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ResourceVersionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_booster_change_keeps_armory_version(self):
+        """Testa se alterar um booster não invalida a versão de armory"""
+        versions = self.client.get('/api/v1/version/').data['resources']
+        with self.captureOnCommitCallbacks(execute=True):
+            Booster.objects.create(name='Vitality Enhancement')
+        updated = self.client.get('/api/v1/version/').data
+
+        self.assertEqual(updated['resources']['armory'], versions['armory'])
+        self.assertNotEqual(updated['resources']['boosters'], versions['boosters'])
+
+    def test_warbond_change_bumps_dependents(self):
+        """Testa se alterar um warbond renova os recursos que o embutem"""
+        versions = self.client.get('/api/v1/version/').data['resources']
+        with self.captureOnCommitCallbacks(execute=True):
+            Warbond.objects.create(name='Democratic Detonation')
+        updated = self.client.get('/api/v1/version/').data['resources']
+
+        for resource in ('warbonds', 'armory', 'stratagems', 'boosters', 'weaponry'):
+            self.assertNotEqual(updated[resource], versions[resource])
+
+
+class CoalescedBumpTests(TestCase):
+    def test_bumps_are_deferred_and_coalesced_per_transaction(self):
+        """Testa se várias alterações na transação geram um único callback de bump"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            for name in ('A', 'B', 'C'):
+                Booster.objects.create(name=name)
+            Warbond.objects.create(name='Cutting Edge')
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(GlobalVersion.objects.filter(resource='boosters').exists())
+
+        callbacks[0]()
+        self.assertTrue(GlobalVersion.objects.filter(resource='boosters').exists())
+        self.assertTrue(GlobalVersion.objects.filter(resource='warbonds').exists())
+
+    def test_deferred_version_bumps_emits_one_bump(self):
+        """Testa se o context manager suprime os bumps e emite um só ao final"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with deferred_version_bumps() as batch:
+                Booster.objects.create(name='A')
+                Booster.objects.create(name='B')
+                self.assertEqual(len(callbacks), 0)
+            self.assertEqual(batch, {'boosters'})
+        self.assertEqual(len(callbacks), 1)
+
+
+class CatalogChangesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = '/api/v1/catalog/changes/'
+        self.warbond = Warbond.objects.create(name='Helldivers Mobilize')
+        self.booster = Booster.objects.create(name='Hellpod Space Optimization', warbond=self.warbond)
+
+    def test_since_is_required(self):
+        """Testa se o parâmetro since é obrigatório e validado"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'since': 'ontem'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_returns_only_recent_changes_and_tombstones(self):
+        """Testa se apenas linhas alteradas e exclusões recentes são retornadas"""
+        old = timezone.now() - timedelta(days=1)
+        Warbond.objects.filter(pk=self.warbond.pk).update(updated_at=old)
+        Booster.objects.filter(pk=self.booster.pk).update(updated_at=old)
+        passive = Passive.objects.create(name='Padded', description='-', effect='+armor')
+        Passive.objects.create(name='Engineering Kit', description='-', effect='+grenades').delete()
+
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        data = self.client.get(self.url, {'since': since}).data
+
+        self.assertEqual([row['id'] for row in data['changes']['passives']], [passive.id])
+        self.assertNotIn('boosters', data['changes'])
+        self.assertEqual(len(data['deleted']['passives']), 1)
+
+    def test_nested_change_marks_parent_as_changed(self):
+        """Testa se alterar o warbond aninhado inclui o booster nas mudanças"""
+        old = timezone.now() - timedelta(days=1)
+        Booster.objects.filter(pk=self.booster.pk).update(updated_at=old)
+
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        data = self.client.get(self.url, {'since': since}).data
+        self.assertEqual([row['id'] for row in data['changes']['boosters']], [self.booster.id])
+
+    def test_deleted_passive_marks_armor_and_set_as_changed(self):
+        """Testa se excluir a passiva (SET_NULL) inclui a armadura e o set nas mudanças"""
+        catalog = seed_catalog(rows=1)
+        old = timezone.now() - timedelta(days=1)
+        for model in (Armor, ArmorSet, Passive, Helmet, Cape, Warbond, AcquisitionSource):
+            model.objects.update(updated_at=old)
+
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        passive = catalog['passives'][0]
+        passive_id = passive.id
+        passive.delete()
+        data = self.client.get(self.url, {'since': since}).data
+
+        armor = catalog['armors'][0]
+        self.assertEqual([row['id'] for row in data['changes']['armors']], [armor.id])
+        self.assertIsNone(data['changes']['armors'][0].get('passive_name'))
+        self.assertEqual([row['id'] for row in data['changes']['sets']], [catalog['sets'][0].id])
+        self.assertEqual(data['deleted']['passives'], [passive_id])
+
+    def test_since_older_than_retention_requires_full_resync(self):
+        """Testa se um since fora da retenção responde 410 pedindo o snapshot completo"""
+        since = (timezone.now() - TOMBSTONE_RETENTION - timedelta(hours=1)).isoformat()
+        response = self.client.get(self.url, {'since': since})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertTrue(response.data['full_resync'])
+
+    def test_expired_tombstones_are_pruned(self):
+        """Testa se registros de exclusão fora da retenção são descartados"""
+        Passive.objects.create(name='Engineering Kit', description='-', effect='-').delete()
+        CatalogTombstone.objects.update(deleted_at=timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1))
+        self.booster.delete()
+        self.assertEqual(list(CatalogTombstone.objects.values_list('model', flat=True)), ['booster.booster'])
+
+
+class CatalogStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.warbond = Warbond.objects.create(name='Helldivers Mobilize')
+            self.booster = Booster.objects.create(name='Hellpod Space Optimization', warbond=self.warbond)
+
+    def test_list_resolves_nested_from_store(self):
+        """Testa se a listagem usa o store para os aninhados (sem JOIN por linha)"""
+        get_catalog_store()
+        # Versão do recurso + versão do store + IDs paginados (count + página)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/v1/boosters/')
+        row = response.data['results'][0]
+        self.assertEqual(row['warbond_details']['name'], 'Helldivers Mobilize')
+
+    def test_store_is_rebuilt_after_version_bump(self):
+        """Testa se o store é substituído (e não alterado) após um bump"""
+        store = get_catalog_store()
+        with self.captureOnCommitCallbacks(execute=True):
+            Warbond.objects.filter(pk=self.warbond.pk).update(name='Cutting Edge')
+            Warbond.objects.get(pk=self.warbond.pk).save()
+        new_store = get_catalog_store()
+        self.assertIsNot(new_store, store)
+        self.assertEqual(store.get(Warbond, self.warbond.pk).name, 'Helldivers Mobilize')
+        self.assertEqual(new_store.get(Booster, self.booster.pk).warbond.name, 'Cutting Edge')
+
+    def test_retrieve_respects_overridden_get_queryset(self):
+        """Testa se o retrieve respeita um get_queryset() sobrescrito em vez de ler só do store"""
+        hidden = Booster.objects.create(name='Vitality Enhancement', warbond=self.warbond)
+
+        class VisibleBoosterViewSet(BoosterViewSet):
+            def get_queryset(self):
+                return super().get_queryset().exclude(pk=hidden.pk)
+
+        view = VisibleBoosterViewSet.as_view({'get': 'retrieve'})
+        factory = APIRequestFactory()
+        response = view(factory.get(f'/api/v1/boosters/{hidden.pk}/'), pk=hidden.pk)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = view(factory.get(f'/api/v1/boosters/{self.booster.pk}/'), pk=self.booster.pk)
+        self.assertEqual(response.data['warbond_details']['name'], 'Helldivers Mobilize')
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = '/api/v1/boosters/'
+        with self.captureOnCommitCallbacks(execute=True):
+            warbond = Warbond.objects.create(name='Helldivers Mobilize')
+            Booster.objects.create(name='Hellpod Space Optimization', warbond=warbond)
+
+    def test_filtered_list_is_computed_once_per_version(self):
+        """Testa se a mesma consulta (em qualquer ordem de parâmetros) vem do cache"""
+        first = self.client.get(self.url, {'search': 'hellpod', 'ordering': 'name'})
+        with self.assertNumQueries(1):
+            second = self.client.get(f'{self.url}?ordering=name&search=hellpod')
+        self.assertEqual(second.json(), first.json())
+
+    def test_version_bump_changes_cache_key(self):
+        """Testa se um bump de versão descarta a resposta em cache"""
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Booster.objects.create(name='Vitality Enhancement')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 2)
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_entry_is_served_while_another_worker_rebuilds(self):
+        """Testa se, com a trava ocupada, a versão anterior é servida sem recalcular"""
+        version = timezone.now()
+        old_version = version - timedelta(seconds=5)
+        get_or_build('catalog:test', old_version, lambda: 'old')
+
+        cache.add('catalog:test:lock', 1)
+        self.assertEqual(get_or_build('catalog:test', version, lambda: 'new'), (old_version, 'old'))
+
+        cache.delete('catalog:test:lock')
+        self.assertEqual(get_or_build('catalog:test', version, lambda: 'new'), (version, 'new'))
+        self.assertFalse(cache.get('catalog:test:lock'))
+
+
+class PrecompressedResponseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = '/api/v1/boosters/'
+        with self.captureOnCommitCallbacks(execute=True):
+            Booster.objects.create(name='Hellpod Space Optimization')
+
+    def test_gzip_body_is_cached_and_served_directly(self):
+        """Testa se o corpo gzip é servido do cache sem recompressão"""
+        expected = self.client.get(self.url, HTTP_ACCEPT='application/json').json()
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), expected)
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(cached.content, response.content)
+
+    def test_brotli_is_preferred_when_available(self):
+        """Testa se br é escolhido quando o cliente aceita e o pacote está instalado"""
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip, br')
+        expected = 'br' if 'br' in COMPRESSORS else 'gzip'
+        self.assertEqual(response['Content-Encoding'], expected)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_api_responses_carry_server_timing(self):
+        """Testa se as respostas da API trazem Server-Timing e logam o nome da view"""
+        with self.assertLogs('common.metrics', level='INFO') as logs:
+            response = self.client.get('/api/v1/boosters/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertNotIn('serializer;dur=', response['Server-Timing'])
+        self.assertIn('view=booster-list', logs.output[0])
+
+    def test_serializer_timing_requires_instrumentation(self):
+        """Testa se o tempo de serialização só aparece com os serializers instrumentados"""
+        self.assertFalse(serializers_instrumented())
+        instrument_serializers()
+        self.addCleanup(uninstrument_serializers)
+        response = self.client.get('/api/v1/boosters/')
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+
+        uninstrument_serializers()
+        self.assertFalse(serializers_instrumented())
+
+
+class QueryBudgetMixinTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_serializer_budget_is_enforced(self):
+        """Testa se o orçamento de serialização é cobrado mesmo com REQUEST_METRICS_SERIALIZERS desligado"""
+        seed_catalog()
+        self.warm_catalog_store()
+        with self.assertRaisesRegex(AssertionError, 'serialização acima'):
+            # Nenhuma medição cabe em um orçamento negativo
+            self.assertWithinBudget('/api/v1/boosters/', 10, serializer_budget_ms=-1)
+        self.assertWithinBudget('/api/v1/boosters/', 10)
+
+
+class ShuffleBoundaryTests(TestCase):
+    def test_first_key_is_exact_and_bounded(self):
+        """Testa se a borda da faixa é o menor float que satisfaz o predicado, mesmo longe de qualquer palpite"""
+        calls = []
+
+        def predicate(key):
+            calls.append(key)
+            return key * 3 + 0.1 >= 1
+
+        key = _first_key(predicate)
+        self.assertTrue(predicate(key))
+        self.assertFalse(predicate(math.nextafter(key, 0.0)))
+        self.assertLessEqual(len(calls), 70)
+        self.assertEqual(_first_key(lambda key: False), 1.0)
+        self.assertEqual(_first_key(lambda key: key >= 1e-300), 1e-300)
+
+
+class SeedScaleCommandTests(TestCase):
+    def test_seed_is_reproducible_and_flushable(self):
+        """Testa se o seed_scale gera os mesmos dados para a mesma semente e recria com --flush"""
+        seed_catalog()
+        options = {'users': 20, 'sets': 50, 'relations_per_user': 2, 'seed': 7, 'stdout': StringIO()}
+        call_command('seed_scale', **options)
+        first = list(UserSet.objects.order_by('name').values_list('name', 'helmet_id', 'is_public'))
+        self.assertEqual(len(first), 50)
+
+        call_command('seed_scale', flush=True, **options)
+        second = list(UserSet.objects.order_by('name').values_list('name', 'helmet_id', 'is_public'))
+        self.assertEqual(first, second)
+
+
+class LoadTestCommandTests(TransactionTestCase):
+    def test_catalog_scenario_reports_every_endpoint(self):
+        """Testa se o loadtest percorre o cenário e reporta latência e queries por endpoint"""
+        seed_catalog()
+        output = StringIO()
+        call_command('loadtest', 'catalog_browse', concurrency=2, iterations=1, seed=1, stdout=output)
+        report = output.getvalue()
+        self.assertIn('armor set detail', report)
+        self.assertNotIn('Nenhum', report)
+        for line in report.splitlines():
+            if line.startswith('armor sets'):
+                # 2 usuários x 1 iteração, sem erros
+                self.assertEqual(line.split()[2:4], ['2', '0'])
+
+    def test_catalog_scenario_orders_by_declared_fields(self):
+        """Testa se o cenário de catálogo só ordena por campos aceitos pelo OrderingFilter da view"""
+        for step in load_scenario('catalog_browse').steps:
+            url = urlsplit(step.path)
+            for ordering in parse_qs(url.query).get('ordering', []):
+                view = resolve(url.path).func.cls
+                self.assertIn(ordering.lstrip('-'), view.ordering_fields, step.name)
+
+    def test_non_json_scenario_is_a_command_error(self):
+        """Testa se um cenário que não é JSON vira CommandError, sem traceback"""
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'cenario.yaml'
+            path.write_text('name: yaml\nsteps: []\n')
+            with self.assertRaises(CommandError):
+                call_command('loadtest', str(path), stdout=StringIO())
+
+
+class FastSerializerParityTests(TestCase):
+    cases = (
+        (ArmorListSerializer, Armor),
+        (StratagemSerializer, Stratagem),
+        (PrimaryWeaponSerializer, PrimaryWeapon),
+        (SecondaryWeaponSerializer, SecondaryWeapon),
+        (ThrowableSerializer, Throwable),
+    )
+
+    def setUp(self):
+        catalog = seed_catalog()
+        # Casos de borda: FK nula (chave omitida em passive_name), sem imagem, choice fora da lista
+        Armor.objects.create(name='Sem passiva', category='light', armor=50, speed=550, stamina=125)
+        Armor.objects.filter(pk=catalog['armors'][0].pk).update(image='')
+        Stratagem.objects.create(name='Sem warbond', department='desconhecido', codex='↑')
+
+    def test_fast_output_matches_drf_serializers(self):
+        """Testa se o FastSerializer produz exatamente a saída dos serializers do DRF, com e sem request"""
+        request = APIRequestFactory().get('/api/v1/')
+        for context in ({}, {'request': request}):
+            for serializer_class, model in self.cases:
+                with self.subTest(serializer=serializer_class.__name__, request=bool(context)):
+                    queryset = model.objects.order_by('pk')
+                    expected = serializer_class(queryset, many=True, context=context).data
+                    rows = FastSerializer.values(serializer_class, queryset)
+                    self.assertEqual(FastSerializer(serializer_class, rows, context).data, expected)
+
+    def test_list_endpoints_match_drf_serializers(self):
+        """Testa se as listagens servidas pelo caminho rápido continuam iguais às do serializer"""
+        request = APIRequestFactory().get('/api/v1/', SERVER_NAME='testserver')
+        response = self.client.get('/api/v1/stratagems/')
+        expected = StratagemSerializer(
+            Stratagem.objects.order_by('department', 'name'), many=True, context={'request': request},
+        ).data
+        self.assertEqual(json.loads(response.content), json.loads(json.dumps(expected)))
+
+    def test_unsupported_fields_fail_at_compile_time(self):
+        """Testa se campos sem equivalente (ex.: métodos do modelo) impedem a compilação"""
+        with self.assertRaises(ImproperlyConfigured):
+            compile_serializer(ArmorSerializer)
+
+
+class NormalizedResponseTests(TestCase):
+    def setUp(self):
+        seed_catalog()
+        cache.clear()
+
+    def denormalize(self, value, entity, document):
+        """Reconstrói a representação aninhada a partir de included/references"""
+        row = dict(value)
+        for field, target in document['references'].get(entity, {}).items():
+            if row.get(field) is None:
+                continue
+            resolve = lambda pk: self.denormalize(document['included'][target][str(pk)], target, document)
+            row[field] = [resolve(pk) for pk in row[field]] if isinstance(row[field], list) else resolve(row[field])
+        return row
+
+    def test_normalized_list_round_trips_to_nested_response(self):
+        """Testa se ?format=normalized traz cada warbond uma vez e equivale à resposta aninhada"""
+        nested = self.client.get('/api/v1/armory/sets/').json()
+        document = self.client.get('/api/v1/armory/sets/?format=normalized').json()
+
+        self.assertEqual(document['count'], nested['count'])
+        self.assertEqual(set(document['included']), {'helmets', 'armors', 'capes', 'passives', 'warbonds',
+                                                     'acquisition_sources'})
+        self.assertEqual(len(document['included']['warbonds']), 5)
+        self.assertIsInstance(document['results'][0]['armor_detail'], int)
+        self.assertEqual(
+            [self.denormalize(row, 'armor_sets', document) for row in document['results']],
+            nested['results'],
+        )
+
+    def test_normalized_detail(self):
+        """Testa se o detalhe normalizado usa 'result' e referencia os aninhados por id"""
+        armor_set_id = self.client.get('/api/v1/armory/sets/').json()['results'][0]['id']
+        nested = self.client.get(f'/api/v1/armory/sets/{armor_set_id}/').json()
+        document = self.client.get(f'/api/v1/armory/sets/{armor_set_id}/?format=normalized').json()
+        self.assertEqual(self.denormalize(document['result'], 'armor_sets', document), nested)
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.catalog = seed_catalog()
+        self.users = [
+            get_user_model().objects.create_user(username=f'sparse{i}', email=f'sparse{i}@example.com', password='x')
+            for i in range(2)
+        ]
+        seed_user_sets(self.users, self.catalog)
+        cache.clear()
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [query['sql'] for query in queries.captured_queries]
+
+    def test_catalog_fields_prune_payload_and_columns(self):
+        """Testa se ?fields= reduz a resposta e as colunas buscadas no caminho rápido"""
+        data, queries = self.get('/api/v1/armory/armors/?fields=id,name,image')
+        self.assertEqual(list(data['results'][0]), ['id', 'name', 'image'])
+        page_query = queries[-1]
+        self.assertNotIn('"stamina"', page_query)
+        self.assertNotIn('JOIN', page_query)
+
+        data, _ = self.get('/api/v1/stratagems/?omit=warbond_detail,description,description_pt_br')
+        self.assertNotIn('warbond_detail', data[0])
+        self.assertIn('codex', data[0])
+
+    def test_community_sets_drop_unused_joins(self):
+        """Testa se os campos esparsos nos sets da comunidade removem JOINs e queries por linha"""
+        full, full_queries = self.get('/api/v1/armory/community-sets/?mode=community')
+        sparse, sparse_queries = self.get('/api/v1/armory/community-sets/?mode=community&fields=id,name,like_count')
+
+        self.assertEqual(list(sparse['results'][0]), ['id', 'name', 'like_count'])
+        self.assertEqual(
+            [row['like_count'] for row in sparse['results']],
+            [row['like_count'] for row in full['results']],
+        )
+        self.assertLess(len(sparse_queries), len(full_queries))
+        page_query = next(sql for sql in sparse_queries if 'armory_userset' in sql and 'LIMIT' in sql)
+        self.assertNotIn('armory_helmet', page_query)
+        self.assertNotIn('"description"', page_query)
+
+    def test_unknown_field_is_rejected(self):
+        """Testa se um campo inexistente em ?fields= retorna 400"""
+        response = self.client.get('/api/v1/armory/armors/?fields=id,bogus')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RequestCaptureTests(TransactionTestCase):
+    def test_captured_requests_are_anonymized_and_replayed(self):
+        """Testa se a captura grava a identidade anonimizada e o replay compara as views capturadas"""
+        armor_set = seed_catalog()['sets'][0]
+        user = get_user_model().objects.create_user(username='scale_0', email='scale_0@example.com', password='x')
+        with TemporaryDirectory() as directory:
+            path = f'{directory}/requests.jsonl'
+            with override_settings(REQUEST_CAPTURE_RATE=1.0, REQUEST_CAPTURE_PATH=path):
+                client = APIClient()
+                client.get('/api/v1/armory/sets/?ordering=name&search=meu+set')
+                client.get('/api/v1/password/reset/reset/MQ/abc-123token/')
+                client.get('/api/v1/check/email/?email=scale_0@example.com')
+                client.get(f'/api/v1/armory/sets/{armor_set.pk}/')
+                client.force_authenticate(user)
+                client.get('/api/v1/armory/user-sets/')
+
+            entries = list(read_capture(path))
+            self.assertEqual([entry['v'] for entry in entries], ['armorset-list', 'armorset-detail', 'user-sets-list'])
+            self.assertEqual(entries[0]['q'], 'ordering=name')
+            self.assertEqual(entries[0]['k'], {})
+            self.assertIn('sets', entries[0]['r'])
+            self.assertEqual(entries[1]['k'], {'pk': str(armor_set.pk)})
+            self.assertNotIn('token', json.dumps(entries))
+            self.assertNotIn('meu', json.dumps(entries))
+            self.assertIsNone(entries[0]['u'])
+            self.assertEqual(entries[2]['u'], anonymize_user(user))
+            self.assertNotIn(user.username, json.dumps(entries))
+            self.assertIsNotNone(entries[2]['n'])
+
+            output = StringIO()
+            call_command('replay_requests', path, stdout=output)
+        report = output.getvalue()
+        self.assertIn('3 requisições reexecutadas', report)
+        self.assertIn('armorset-detail', report)
+        self.assertIn('user-sets-list', report)
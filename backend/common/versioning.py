@@ -0,0 +1,141 @@
+"""
+Utilitários de leitura e bump das versões do catálogo
+
+Cada família de modelos monitorados tem sua própria linha em GlobalVersion,
+além da linha 'global', que muda a cada alteração de qualquer família.
+
+Os bumps disparados pelos sinais são adiados para o commit da transação e
+deduplicados por recurso: uma edição em massa gera um único UPDATE.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import GlobalVersion
+
+
+GLOBAL_RESOURCE = 'global'
+
+# Famílias de modelos monitorados (ver common.signals.RESOURCE_MODELS)
+RESOURCES = ('armory', 'weaponry', 'stratagems', 'boosters', 'warbonds')
+
+# Recursos cujas respostas embutem dados de outro recurso (ex.: pass_detail,
+# warbond_detail e acquisition_source_detail embutem warbonds/fontes)
+RESOURCE_DEPENDENTS = {
+    'warbonds': ('armory', 'weaponry', 'stratagems', 'boosters'),
+}
+
+
+def get_version(resource=GLOBAL_RESOURCE):
+    """Retorna o timestamp atual de um recurso (cria a linha se não existir)"""
+    version, _ = GlobalVersion.objects.get_or_create(resource=resource)
+    return version.updated_at
+
+
+def get_versions():
+    """Retorna o mapa {recurso: timestamp} de todos os recursos em uma query"""
+    names = (GLOBAL_RESOURCE,) + RESOURCES
+    versions = dict(
+        GlobalVersion.objects.filter(resource__in=names).values_list('resource', 'updated_at')
+    )
+    for name in names:
+        if name not in versions:
+            versions[name] = get_version(name)
+    return versions
+
+
+def expand_resources(resources):
+    """Inclui os recursos dependentes e a linha global no conjunto a ser renovado"""
+    expanded = {GLOBAL_RESOURCE}
+    for resource in resources:
+        expanded.add(resource)
+        expanded.update(RESOURCE_DEPENDENTS.get(resource, ()))
+    return expanded
+
+
+def bump_versions(resources):
+    """Renova o timestamp dos recursos informados (e de seus dependentes) em um único UPDATE"""
+    expanded = expand_resources(resources)
+    now = timezone.now()
+    updated = GlobalVersion.objects.filter(resource__in=expanded).update(updated_at=now)
+    if updated < len(expanded):
+        existing = set(
+            GlobalVersion.objects.filter(resource__in=expanded).values_list('resource', flat=True)
+        )
+        for resource in sorted(expanded - existing):
+            GlobalVersion.objects.get_or_create(resource=resource)
+
+
+# ============================================================================
+# BUMPS ADIADOS PARA O COMMIT
+# ============================================================================
+
+_local = threading.local()
+
+
+class _PendingBump:
+    """Callback de on_commit que acumula os recursos alterados na transação"""
+
+    def __init__(self, resources):
+        self.resources = set(resources)
+        self.executed = False
+
+    def __call__(self):
+        self.executed = True
+        bump_versions(self.resources)
+
+
+def schedule_version_bump(resources, using=None):
+    """
+    Agenda o bump dos recursos para o commit da transação atual.
+
+    Fora de um bloco atômico o bump é imediato. Dentro dele, todos os recursos
+    da mesma transação são agregados em um único callback de on_commit.
+    Dentro de deferred_version_bumps() apenas acumula para o final do bloco.
+    """
+    batch = getattr(_local, 'batch', None)
+    if batch is not None:
+        batch.update(resources)
+        return
+
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        bump_versions(resources)
+        return
+
+    # Reaproveita o callback já registrado, desde que ele não pertença a um
+    # savepoint mais interno (que poderia ser desfeito sozinho)
+    savepoint_ids = set(connection.savepoint_ids)
+    for sids, callback, robust in connection.run_on_commit:
+        if isinstance(callback, _PendingBump) and not callback.executed and sids <= savepoint_ids:
+            callback.resources.update(resources)
+            return
+
+    transaction.on_commit(_PendingBump(resources), using=using)
+
+
+@contextmanager
+def deferred_version_bumps(using=None):
+    """
+    Suprime os bumps durante o bloco e emite exatamente um ao final.
+
+    Uso em jobs de importação/edição em massa:
+        with deferred_version_bumps():
+            for row in rows:
+                Armor.objects.update_or_create(...)
+    """
+    if getattr(_local, 'batch', None) is not None:
+        # Bloco aninhado: o bloco externo emite o bump
+        yield _local.batch
+        return
+
+    _local.batch = batch = set()
+    try:
+        yield batch
+    finally:
+        _local.batch = None
+        if batch:
+            schedule_version_bump(batch, using=using)
@@ -118,6 +118,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'common.metrics.RequestMetricsMiddleware',  # Server-Timing + log de queries por view (/api/v1/)
+    'common.capture.RequestCaptureMiddleware',  # Amostra de requisições para replay (só com REQUEST_CAPTURE_RATE > 0)
     'django.middleware.gzip.GZipMiddleware',  # Compressão de respostas
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Adicionar após SecurityMiddleware
     'corsheaders.middleware.CorsMiddleware',
@@ -150,6 +152,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# ============================================================================
+# CAPTURA DE REQUISIÇÕES
+# ============================================================================
+
+# Amostra de requisições para replay local (common.capture.RequestCaptureMiddleware):
+# fração amostrada (0 desliga) e arquivo JSON Lines de destino
+REQUEST_CAPTURE_RATE = config('REQUEST_CAPTURE_RATE', default=0.0, cast=float)
+REQUEST_CAPTURE_PATH = config('REQUEST_CAPTURE_PATH', default=str(BASE_DIR / 'captures' / 'requests.jsonl'))
+
 # ============================================================================
 # BANCO DE DADOS E VALIDAÇÕES
 # ============================================================================
@@ -170,6 +181,43 @@ DATABASES = {
     )
 }
 
+# Cache - Mesmo esquema do banco: escolhido pela variável CACHE_URL
+#
+# COMO FUNCIONA:
+# - LOCAL/TESTES (sem CACHE_URL): LocMemCache, em memória do processo
+# - CACHE_URL=file:///var/tmp/helldivers-cache -> FileBasedCache (entradas
+#   compartilhadas entre workers; a trava de reconstrução é só best-effort)
+# - CACHE_URL=redis://host:6379/0 -> RedisCache (requer o pacote redis; trava
+#   atômica, um único worker reconstrói cada entrada)
+#
+# As chaves das respostas do catálogo incluem a GlobalVersion, então nenhuma
+# invalidação manual é necessária: uma nova versão simplesmente gera novas chaves.
+CACHE_URL = config('CACHE_URL', default='locmem://')
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    _cache_backend = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    }
+elif CACHE_URL.startswith('file://'):
+    _cache_backend = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_URL[len('file://'):],
+    }
+else:
+    _cache_backend = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'helldivers',
+    }
+
+CACHES = {
+    'default': {
+        **_cache_backend,
+        'KEY_PREFIX': 'helldivers',
+        'TIMEOUT': config('CACHE_TIMEOUT', default=60 * 60 * 24, cast=int),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -383,4 +431,41 @@ ACCOUNT_EMAIL_CONFIRMATION_AUTHENTICATED_REDIRECT_URL = FRONTEND_URL + '/dashboa
 ACCOUNT_EMAIL_CONFIRMATION_ANONYMOUS_REDIRECT_URL = FRONTEND_URL + '/login'
 
 # Verificação de Email (optional: não obrigatória, mandatory: obrigatória)
-ACCOUNT_EMAIL_VERIFICATION = 'optional'
\ No newline at end of file
+ACCOUNT_EMAIL_VERIFICATION = 'optional'
+
+# ============================================================================
+# CONTADORES DOS SETS DA COMUNIDADE
+# ============================================================================
+
+# Curtidas/favoritos em write-behind (armory.counters): os toggles só gravam
+# deltas, aplicados aos UserSets em lote pelo processo contínuo
+# `python manage.py flush_set_counters --interval 10` (ver README)
+USERSET_COUNTERS_WRITE_BEHIND = config('USERSET_COUNTERS_WRITE_BEHIND', default=False, cast=bool)
+
+# ============================================================================
+# LOGGING
+# ============================================================================
+
+# Métricas por requisição da API (common.metrics.RequestMetricsMiddleware):
+# uma linha por requisição com view, queries, tempo de banco e de serialização,
+# em INFO (REQUEST_METRICS_LOG_LEVEL=INFO liga o log). O tempo de serialização
+# troca o `.data` dos serializers do DRF no processo e só é medido com
+# REQUEST_METRICS_SERIALIZERS=True
+REQUEST_METRICS_SERIALIZERS = config('REQUEST_METRICS_SERIALIZERS', default=False, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'common.metrics': {
+            'handlers': ['console'],
+            'level': config('REQUEST_METRICS_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from .models import Stratagem, UserStratagemRelation
 from warbonds.serializers import WarbondSerializer
+from common.store import CatalogRelatedField
 
 class StratagemSerializer(serializers.ModelSerializer):
     department_display = serializers.CharField(source='get_department_display', read_only=True)
-    warbond_detail = WarbondSerializer(source='warbond', read_only=True)
+    warbond_detail = CatalogRelatedField(WarbondSerializer(), source='warbond')
 
     class Meta:
         model = Stratagem
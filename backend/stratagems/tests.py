@@ -1,3 +1,33 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from common.testing import QueryBudgetMixin, seed_catalog
+from stratagems.models import UserStratagemRelation
+
+User = get_user_model()
+
+
+class StratagemQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Orçamento de queries dos endpoints de estratagemas (warbond_detail aninhado)"""
+
+    def setUp(self):
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog = seed_catalog()
+        self.warm_catalog_store()
+
+    def test_list_and_detail(self):
+        """Testa se a lista e o detalhe não consultam o warbond por item"""
+        # Sem paginação: versão + IDs + versão do store
+        response = self.assertWithinBudget('/api/v1/stratagems/', 3)
+        self.assertIsNotNone(response.data[0]['warbond_detail'])
+        self.assertWithinBudget(f'/api/v1/stratagems/{self.catalog["stratagems"][0].id}/', 2)
+
+    def test_user_relations_by_type(self):
+        """Testa a listagem de estratagemas favoritados pelo usuário"""
+        user = User.objects.create_user(username='diver', email='diver@example.com', password='x')
+        for stratagem in self.catalog['stratagems']:
+            UserStratagemRelation.objects.create(user=user, stratagem=stratagem, relation_type='favorite')
+        self.client.force_authenticate(user)
+        self.assertWithinBudget('/api/v1/stratagems/user-stratagems/by_type/?type=favorite', 2)
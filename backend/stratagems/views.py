@@ -4,14 +4,17 @@ from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Stratagem, UserStratagemRelation
 from .serializers import StratagemSerializer, UserStratagemRelationSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin, SparseFieldsMixin
 
-class StratagemViewSet(viewsets.ReadOnlyModelViewSet):
+class StratagemViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows stratagems to be viewed.
     """
     queryset = Stratagem.objects.all()
     serializer_class = StratagemSerializer
     permission_classes = [permissions.AllowAny]
+    version_resource = 'stratagems'
+    fast_list = True
     pagination_class = None
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['department', 'unlock_level']
@@ -19,7 +22,7 @@ class StratagemViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['name', 'department', 'unlock_level', 'cost']
     ordering = ['department', 'name']
 
-class UserStratagemRelationViewSet(viewsets.ModelViewSet):
+class UserStratagemRelationViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing user relations with stratagems (favorites, collection, wishlist)
     """
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warbonds', '0005_acquisitionsource_description_pt_br'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='acquisitionsource',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='acquisitionsource',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -8,6 +8,9 @@ class AcquisitionSource(models.Model):
     description = models.TextField(verbose_name="Descrição", blank=True)
     description_pt_br = models.TextField(verbose_name="Descrição (PT-BR)", blank=True, null=True)
     
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
     class Meta:
         verbose_name = "Outros"
         verbose_name_plural = "Outros"
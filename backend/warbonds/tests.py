@@ -1,3 +1,33 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from common.testing import QueryBudgetMixin, seed_catalog
+
+
+class WarbondQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Orçamento de queries dos warbonds e dos endpoints que os aninham
+    (acquisition_source_detail das armas, warbond_details dos boosters).
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog = seed_catalog()
+        self.warm_catalog_store()
+
+    def test_warbond_list_and_detail(self):
+        """Testa a listagem e o detalhe de warbonds"""
+        self.assertWithinBudget('/api/v1/warbonds/warbonds/', 4)
+        self.assertWithinBudget(f'/api/v1/warbonds/warbonds/{self.catalog["warbonds"][0].id}/', 2)
+
+    def test_weapon_lists_with_acquisition_source(self):
+        """Testa se as armas não consultam a fonte de obtenção por item"""
+        for url in ('/api/v1/weaponry/primary/', '/api/v1/weaponry/secondary/',
+                    '/api/v1/weaponry/throwable/'):
+            response = self.assertWithinBudget(url, 3)
+            self.assertIsNotNone(response.data[0]['acquisition_source_detail'])
+
+    def test_booster_list(self):
+        """Testa se os boosters não consultam o warbond por item"""
+        self.assertWithinBudget('/api/v1/boosters/', 4)
@@ -3,12 +3,14 @@ from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from warbonds.models import Warbond
 from warbonds.serializers import WarbondSerializer, WarbondListSerializer
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin
 
 
-class WarbondViewSet(viewsets.ModelViewSet):
+class WarbondViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ModelViewSet):
     """ViewSet para Warbonds (antigos Passes de Batalha)"""
     queryset = Warbond.objects.all()
     permission_classes = [AllowAny]
+    version_resource = 'warbonds'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     search_fields = ['name']
@@ -84,6 +84,9 @@ class WeaponryBase(models.Model):
     )
     cost = models.IntegerField(default=0, verbose_name="Cost")
 
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         abstract = True
     
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from warbonds.serializers import AcquisitionSourceSerializer
+from common.store import CatalogRelatedField
 
 from .models import (
     PrimaryWeapon, SecondaryWeapon, Throwable,
@@ -8,23 +9,24 @@ from .models import (
 
 
 # Weapon Serializers
+# created_at/updated_at são controle da sincronização do catálogo, fora do payload público
 class PrimaryWeaponSerializer(serializers.ModelSerializer):
-    acquisition_source_detail = AcquisitionSourceSerializer(source='acquisition_source', read_only=True)
+    acquisition_source_detail = CatalogRelatedField(AcquisitionSourceSerializer(), source='acquisition_source')
     class Meta:
         model = PrimaryWeapon
-        fields = '__all__'
+        exclude = ['created_at', 'updated_at']
 
 class SecondaryWeaponSerializer(serializers.ModelSerializer):
-    acquisition_source_detail = AcquisitionSourceSerializer(source='acquisition_source', read_only=True)
+    acquisition_source_detail = CatalogRelatedField(AcquisitionSourceSerializer(), source='acquisition_source')
     class Meta:
         model = SecondaryWeapon
-        fields = '__all__'
+        exclude = ['created_at', 'updated_at']
 
 class ThrowableSerializer(serializers.ModelSerializer):
-    acquisition_source_detail = AcquisitionSourceSerializer(source='acquisition_source', read_only=True)
+    acquisition_source_detail = CatalogRelatedField(AcquisitionSourceSerializer(), source='acquisition_source')
     class Meta:
         model = Throwable
-        fields = '__all__'
+        exclude = ['created_at', 'updated_at']
 
 # Relation Serializers
 class UserPrimaryWeaponRelationSerializer(serializers.ModelSerializer):
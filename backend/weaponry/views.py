@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from common.mixins import ConditionalGetMixin, CatalogStoreMixin, SparseFieldsMixin
 from .models import (
     PrimaryWeapon, SecondaryWeapon, Throwable,
     UserPrimaryWeaponRelation, UserSecondaryWeaponRelation, UserThrowableRelation
@@ -11,7 +12,7 @@ from .serializers import (
 )
 
 # Base Mixin for Relation Views
-class UserRelationMixin:
+class UserRelationMixin(SparseFieldsMixin):
     permission_classes = [permissions.IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
@@ -66,26 +67,32 @@ class UserRelationMixin:
         return Response(serializer.data)
 
 # ViewSets
-class PrimaryWeaponViewSet(viewsets.ReadOnlyModelViewSet):
+class PrimaryWeaponViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PrimaryWeapon.objects.all()
     serializer_class = PrimaryWeaponSerializer
     permission_classes = [permissions.AllowAny]
+    version_resource = 'weaponry'
+    fast_list = True
     filterset_fields = ['weapon_type', 'damage_type', 'source']
     search_fields = ['name', 'name_pt_br']
     pagination_class = None
 
-class SecondaryWeaponViewSet(viewsets.ReadOnlyModelViewSet):
+class SecondaryWeaponViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ReadOnlyModelViewSet):
     queryset = SecondaryWeapon.objects.all()
     serializer_class = SecondaryWeaponSerializer
     permission_classes = [permissions.AllowAny]
+    version_resource = 'weaponry'
+    fast_list = True
     filterset_fields = ['weapon_type', 'damage_type', 'source']
     search_fields = ['name', 'name_pt_br']
     pagination_class = None
 
-class ThrowableViewSet(viewsets.ReadOnlyModelViewSet):
+class ThrowableViewSet(ConditionalGetMixin, CatalogStoreMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Throwable.objects.all()
     serializer_class = ThrowableSerializer
     permission_classes = [permissions.AllowAny]
+    version_resource = 'weaponry'
+    fast_list = True
     filterset_fields = ['weapon_type', 'damage_type', 'source']
     search_fields = ['name', 'name_pt_br']
     pagination_class = None